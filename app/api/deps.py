@@ -1,62 +1,56 @@
 from fastapi import Depends, HTTPException, Security, Request, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, db_breaker
 from app.models.user import User
 from app.core.config import settings
-from app.core.jwt import decode_token
-from app.core.redis import redis_client
+from app.core.access_token import decode_access_token
+from app.services.session_store import check_session
+from app.services.activity import activity
+from app.services.client_policy import parse_scope
+from app.core.resilience import DependencyUnavailable
 from app.models.session import UserSession
 
 security = HTTPBearer()
 
 
 def get_current_token(credentials=Security(security)):
-    token = credentials.credentials
+    return validate_access_token(credentials.credentials)
 
-    payload = decode_token(token)
 
-    # Session revocation check (global logout)
+def validate_access_token(token: str) -> dict:
+    payload = decode_access_token(token)
+
+    # Client credentials tokens carry no sid: no user session to check.
+    # Every token issued for a user is bound to its session.
     sid = payload.get("sid")
     if not sid:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token (no session)",
-        )
+        return payload
 
-    # Redis active session must exist
-    if redis_client:
-        if not redis_client.get(f"oauth:session:active:{sid}"):
-            raise HTTPException(status_code=401, detail="Session expired")
+    # Session revocation check (global logout)
 
-    # Redis revoked session must NOT exist
-    if redis_client.get(f"oauth:session:revoked:{sid}"):
-        raise HTTPException(status_code=401, detail="Session revoked")
+    # Redis: session must be active and not revoked
+    check_session(sid)
 
+    # Last used: in memory here, written to the database in batches
+    activity.record(sid, payload.get("aud"))
 
     return payload
 
 
 def require_scope(required_scope: str):
+    # get_current_token has already checked the session in Redis
     def checker(payload=Depends(get_current_token)):
-        sid = payload.get("sid",None)
-        if sid:
-            # Redis revoked session must NOT exist
-            if redis_client.get(f"oauth:session:revoked:{sid}"):
-                raise HTTPException(status_code=401, detail="Session revoked")
-
-            # Redis active session must exist
-            if redis_client:
-                if not redis_client.get(f"oauth:session:active:{sid}"):
-                    raise HTTPException(status_code=401, detail="Session expired")
-
-
-        scopes = payload.get("scope", "").split()
-        if required_scope not in scopes:
+        if required_scope not in parse_scope(payload.get("scope")):
             raise HTTPException(status_code=403, detail="Insufficient scope")
     return checker
 
 def get_db():
+    # Fail fast while the database breaker is open instead of waiting
+    # for connect and pool timeouts on every request
+    if db_breaker.is_open():
+        raise DependencyUnavailable("database")
+
     db = SessionLocal()
     try:
         yield db
@@ -80,17 +74,22 @@ def get_current_user_from_cookie(
     db: Session,
 ):
     session_id = get_session_id_from_cookie(request)
-    session = (
-        db.query(UserSession)
+
+    # Read-mostly lookups go to a replica unless the session was just
+    # created or revoked (pinned to the primary). The id names its shard.
+    shard_db = db.for_session(session_id)
+    session = shard_db.read(
+        lambda: shard_db.query(UserSession)
         .filter_by(id=session_id, is_active=True)
-        .first()
+        .first(),
+        pin_key=session_id,
     )
     if not session:
         raise HTTPException(status_code=401)
-    user = (
-        db.query(User)
+    user = db.read(
+        lambda: db.query(User)
         .filter_by(id=session.user_id, is_active=True)
-        .first()
+        .first(),
     )
     if not user:
         raise HTTPException(status_code=401)
@@ -0,0 +1,157 @@
+"""
+Lean ASGI handlers for the two highest-QPS endpoints, enabled with
+FASTPATH_ENABLED:
+
+    POST /api/v1/oauth/introspect
+    GET  /api/v1/userinfo/me
+
+They run the same service code as the FastAPI routes but skip dependency
+resolution, the database session (introspection never uses it), form and
+Pydantic processing, and serialize with orjson. Blocking work (signature
+check, Redis) still runs in the threadpool, once per request instead of
+once per dependency.
+
+Only the well-formed common case is handled here. A request FastAPI would
+reject or treat specially (missing or duplicate field, other content type,
+no Bearer credentials) is passed on to the regular route, so every error
+response stays identical.
+"""
+
+from urllib.parse import parse_qsl
+
+import orjson
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import validate_access_token
+from app.api.v1.userinfo import userinfo_response
+from app.core.resilience import DependencyUnavailable
+from app.services.token_service import introspect
+
+INTROSPECT_PATH = "/api/v1/oauth/introspect"
+USERINFO_PATH = "/api/v1/userinfo/me"
+
+FORM_CONTENT_TYPE = b"application/x-www-form-urlencoded"
+INACTIVE = orjson.dumps({"active": False})
+
+
+def _form_token(content_type: bytes, body: bytes):
+    if content_type.split(b";", 1)[0].strip().lower() != FORM_CONTENT_TYPE:
+        return None
+    try:
+        pairs = parse_qsl(body.decode("utf-8"), keep_blank_values=True)
+    except UnicodeDecodeError:
+        return None
+    tokens = [value for name, value in pairs if name == "token"]
+    if len(tokens) != 1 or not tokens[0]:
+        return None
+    return tokens[0]
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _replay(body: bytes, receive):
+    """receive() for the regular route after the body was already read."""
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _send_json(send, status: int, body: bytes, headers=()):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                *headers,
+                (b"content-length", str(len(body)).encode()),
+                (b"content-type", b"application/json"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def _userinfo(token: str) -> dict:
+    return userinfo_response(validate_access_token(token))
+
+
+class FastPathMiddleware:
+
+    def __init__(self, app, router=None):
+        self.app = app
+        self.router = router
+        self._routes = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path, method = scope["path"], scope["method"]
+            if path == INTROSPECT_PATH and method == "POST":
+                await self.introspect(scope, receive, send)
+                return
+            if path == USERINFO_PATH and method == "GET":
+                await self.userinfo(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    async def introspect(self, scope, receive, send):
+        headers = dict(scope["headers"])
+        body = await _read_body(receive)
+        token = _form_token(headers.get(b"content-type", b""), body)
+        if token is None:
+            await self.app(scope, _replay(body, receive), send)
+            return
+
+        self._tag(scope)
+        result = await run_in_threadpool(introspect, token)
+        await _send_json(send, 200, orjson.dumps(result) if result["active"] else INACTIVE)
+
+    async def userinfo(self, scope, receive, send):
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not credentials:
+            await self.app(scope, receive, send)
+            return
+
+        self._tag(scope)
+        try:
+            result = await run_in_threadpool(_userinfo, credentials)
+        except HTTPException as exc:
+            # Same rendering as FastAPI's default HTTPException handler
+            extra = [(k.lower().encode(), v.encode()) for k, v in (exc.headers or {}).items()]
+            await _send_json(send, exc.status_code, orjson.dumps({"detail": exc.detail}), extra)
+            return
+        except DependencyUnavailable as exc:
+            # Same as app.main.dependency_unavailable
+            await _send_json(send, 503, orjson.dumps({"detail": str(exc)}), [(b"retry-after", b"5")])
+            return
+
+        await _send_json(send, 200, orjson.dumps(result))
+
+    def _tag(self, scope):
+        # Outer middleware (request capture) reads the matched route
+        if self.router is None:
+            return
+        if self._routes is None:
+            self._routes = {
+                (route.path, method): route
+                for route in self.router.routes
+                for method in getattr(route, "methods", None) or ()
+            }
+        route = self._routes.get((scope["path"], scope["method"]))
+        if route is not None:
+            scope["route"] = route
@@ -1,6 +1,6 @@
 
 from fastapi import APIRouter
-from app.api.v1 import oauth, introspect, revoke, jwks, logout, sso, userinfo
+from app.api.v1 import oauth, introspect, revoke, jwks, logout, sso, userinfo, revocations, sessions
 from app.api.examples import example
 
 api_router = APIRouter()
@@ -8,8 +8,11 @@ api_router = APIRouter()
 api_router.include_router(oauth.router, prefix="/oauth", tags=["oauth"])
 api_router.include_router(introspect.router, prefix="/oauth", tags=["introspect"])
 api_router.include_router(revoke.router, prefix="/oauth", tags=["revoke"])
+api_router.include_router(jwks.router, prefix="/oauth", tags=["jwks"])
+api_router.include_router(revocations.router, prefix="/oauth", tags=["revocations"])
 api_router.include_router(sso.router, prefix="/sso", tags=["sso"])
 api_router.include_router(userinfo.router, prefix="/userinfo", tags=["userinfo"])
 api_router.include_router(logout.router, prefix="/sso", tags=["logout"])
+api_router.include_router(sessions.router, prefix="/sso", tags=["sessions"])
 
 api_router.include_router(example.router, prefix="/test", tags=["test"])
\ No newline at end of file
@@ -1,20 +1,12 @@
 from fastapi import APIRouter, Depends, Form
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.api.deps import get_db
 from app.services.token_service import TokenService
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/introspect")
 def introspect(
     token: str = Form(...),
@@ -1,22 +1,19 @@
-import json
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
-router = APIRouter()
+from app.core.keys import keyring
 
-with open("keys/public.pem", "r") as f:
-    PUBLIC_KEY = f.read()
+router = APIRouter()
 
 
 @router.get("/jwks.json")
-def jwks():
-    return {
-        "keys": [
-            {
-                "kty": "RSA",
-                "use": "sig",
-                "alg": "RS256",
-                "kid": "auth-server-key",
-                "pem": PUBLIC_KEY,
-            }
-        ]
-    }
\ No newline at end of file
+def jwks(request: Request):
+    headers = {"ETag": keyring.jwks_etag, "Cache-Control": "public, max-age=300"}
+
+    if request.headers.get("if-none-match") == keyring.jwks_etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=keyring.jwks_body,
+        media_type="application/json",
+        headers=headers,
+    )
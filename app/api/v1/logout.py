@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.api.deps import get_current_user_from_cookie,get_db
 from app.models.session import UserSession
 from app.models.token import RefreshToken
-from app.core.redis import redis_client
 from app.core.config import settings
+from app.services.session_service import revoke_in_store
+from app.services.audit import audit
 
 router = APIRouter()
 
+LOGOUT_CHUNK_SIZE = 1000
+
 
 @router.post("/logout")
 def logout(
@@ -19,49 +23,48 @@ def logout(
 ):
     user, current_session = get_current_user_from_cookie(request, db)
 
-    # Load all active sessions for user
-    sessions = (
-        db.query(UserSession)
-        .filter(
-            UserSession.user_id == user.id,
-            UserSession.is_active == True,
-        )
-        .all()
-    )
+    def revoke_shard(shard_db):
+        # Stream the user's active session ids in chunks instead of loading
+        # every row; Redis is revoked chunk by chunk (one round trip each)
+        active_ids = shard_db.execute(
+            select(UserSession.id)
+            .where(
+                UserSession.user_id == user.id,
+                UserSession.is_active == True,
+            )
+            .execution_options(yield_per=LOGOUT_CHUNK_SIZE)
+        ).scalars()
 
-    # Redis: revoke & deactivate all sessions
-    if redis_client:
-        for s in sessions:
-            # Remove active session marker
-            redis_client.delete(f"oauth:session:active:{s.id}")
+        for chunk in active_ids.partitions():
+            revoke_in_store(shard_db, chunk)
 
-            # Blacklist access tokens tied to this session
-            redis_client.setex(
-                f"oauth:session:revoked:{s.id}",
-                settings.ACCESS_TOKEN_EXPIRE_SECONDS,
-                "1",
+        # DB: mark all sessions inactive
+        (
+            shard_db.query(UserSession)
+            .filter(UserSession.user_id == user.id)
+            .update(
+                {
+                    "is_active": False,
+                    "expires_at": datetime.utcnow(),
+                }
             )
+        )
 
-    # DB: mark all sessions inactive
-    (
-        db.query(UserSession)
-        .filter(UserSession.user_id == user.id)
-        .update(
-            {
-                "is_active": False,
-                "expires_at": datetime.utcnow(),
-            }
+        # Revoke all refresh tokens
+        (
+            shard_db.query(RefreshToken)
+            .filter(RefreshToken.user_id == user.id)
+            .update({"is_revoked": True})
         )
-    )
 
-    # Revoke all refresh tokens
-    (
-        db.query(RefreshToken)
-        .filter(RefreshToken.user_id == user.id)
-        .update({"is_revoked": True})
-    )
+    # Every shard, in parallel: sessions written before a change of shard
+    # count or before sharding was enabled live outside the home shard
+    db.each_shard(revoke_shard)
+
+    # Device list of this user: read from the primary for a while
+    db.pin(f"user:{user.id}")
 
-    db.commit()
+    audit.emit("logout.global", user_id=str(user.id), session_id=str(current_session.id))
 
     # Delete session cookie
     response.delete_cookie(
@@ -4,21 +4,12 @@ from fastapi import Request
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.db.session import SessionLocal
 from app.services.oauth_service import OAuthService
-from app.api.deps import get_current_user_from_cookie
+from app.api.deps import get_current_user_from_cookie, get_db
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/authorize")
 def authorize(
     request: Request,
@@ -29,6 +20,7 @@ def authorize(
     state: Optional[str] = None,
     code_challenge: Optional[str] = None,
     code_challenge_method: Optional[str] = None,
+    nonce: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     try:
@@ -49,8 +41,10 @@ def authorize(
         redirect_uri=redirect_uri,
         scope=scope,
         user_id=user.id,
+        session_id=session.id,
         code_challenge=code_challenge,
         code_challenge_method=code_challenge_method,
+        nonce=nonce,
     )
 
     redirect_url = f"{redirect_uri}?code={auth_code}"
@@ -0,0 +1,52 @@
+import re
+from urllib.parse import unquote_plus
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Security
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.services.client_registry import client_registry
+from app.services.revocation_feed import read_revocations
+from app.utils.password import verify_password
+
+router = APIRouter()
+basic = HTTPBasic(auto_error=False)
+
+STREAM_ID = re.compile(r"^\d+(-\d+)?$")
+
+
+def require_confidential_client(
+    credentials: HTTPBasicCredentials = Security(basic),
+    db: Session = Depends(get_db),
+):
+    """client_secret_basic authentication of a resource server."""
+    unauthorized = HTTPException(
+        status_code=401,
+        detail="Invalid client credentials",
+        headers={"WWW-Authenticate": "Basic"},
+    )
+    if not credentials:
+        raise unauthorized
+
+    # RFC 6749 2.3.1: both parts are form-urlencoded
+    client_id = unquote_plus(credentials.username)
+    client_secret = unquote_plus(credentials.password)
+
+    client = client_registry.get(db, client_id)
+    if not client or not client.is_confidential or not client.client_secret_hash:
+        raise unauthorized
+    if not verify_password(client_secret, client.client_secret_hash):
+        raise unauthorized
+    return client
+
+
+@router.get("/revocations", dependencies=[Depends(require_confidential_client)])
+def revocations(
+    since: str = "0",
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    if not STREAM_ID.match(since):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return read_revocations(since=since, limit=limit)
@@ -0,0 +1,44 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user_from_cookie, get_db
+from app.core.config import settings
+from app.services.session_service import SessionService
+
+router = APIRouter()
+
+
+@router.get("/sessions")
+def list_sessions(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    user, current_session = get_current_user_from_cookie(request, db)
+
+    page = SessionService(db).list_sessions(user.id, limit=limit, cursor=cursor)
+    for entry in page["sessions"]:
+        entry["current"] = entry["id"] == str(current_session.id)
+    return page
+
+
+@router.delete("/sessions/{session_id}")
+def revoke_session(
+    session_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    user, current_session = get_current_user_from_cookie(request, db)
+
+    SessionService(db).revoke_session(user.id, session_id)
+
+    # Logging out this very device
+    if session_id == uuid.UUID(str(current_session.id)):
+        response.delete_cookie(key=settings.SESSION_COOKIE_NAME, path="/")
+
+    return {"revoked": str(session_id)}
@@ -4,25 +4,20 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timedelta
 
-from app.db.session import SessionLocal
+from app.api.deps import get_db
 from app.models.user import User
 from app.models.session import UserSession
-from app.utils.password import verify_password
+from app.utils.password import verify_and_rehash
 from app.core.config import settings
-from app.core.redis import redis_client
+from app.core.redis import redis_breaker
+from app.services.session_store import session_store
+from app.core.resilience import DependencyUnavailable
+from app.services.audit import audit
 
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/login")
 def login(
     email: str = Form(...),
@@ -30,33 +25,52 @@ def login(
     next: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
+    # A session that can't be stored in Redis is unusable, so reject
+    # before spending a password hash on it
+    if session_store and redis_breaker.is_open():
+        raise DependencyUnavailable("redis")
+
     # Authenticate user
     user = db.query(User).filter_by(email=email, is_active=True).first()
-    if not user or not verify_password(password, user.password_hash):
+    verified, new_hash = verify_and_rehash(password, user.password_hash) if user else (False, None)
+    if not verified:
+        audit.emit("login.failed", user_id=str(user.id) if user else None)
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    # Create DB session (source of truth)
+    # Hash predates the current policy (scheme or cost): upgrade it now,
+    # while the plaintext is available. Committed with the session below.
+    if new_hash:
+        user.password_hash = new_hash
+
+    # Create DB session (source of truth), on the user's shard
     expires_at = datetime.utcnow() + timedelta(days=7)
+    shard_db = db.for_user(user.id)
 
     session = UserSession(
+        id=shard_db.new_session_id(),
         user_id=user.id,
         is_active=True,
         created_at=datetime.utcnow(),
         expires_at=expires_at,
     )
 
-    db.add(session)
+    shard_db.add(session)
     db.commit()
-    db.refresh(session)
+    shard_db.refresh(session)
+
+    # Replicas may not have the new session yet
+    db.pin(session.id)
 
     # Store session presence in Redis (fast-path)
-    if redis_client:
-        redis_client.setex(
-            f"oauth:session:active:{session.id}",
+    if session_store:
+        session_store.activate(
+            session.id,
+            user.id,
             int((expires_at - datetime.utcnow()).total_seconds()),
-            str(user.id),
         )
 
+    audit.emit("login.succeeded", user_id=str(user.id), session_id=str(session.id))
+
     # Redirect with cookie
     response = RedirectResponse(
         url=next or "/",
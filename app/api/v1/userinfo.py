@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from app.api.deps import get_current_token
+from app.services.claims_cache import claims_cache, claims_for_scope
+from app.services.client_policy import parse_scope
 
 router = APIRouter()
 
 
 @router.get("/me")
 def userinfo(payload=Depends(get_current_token)):
-    return {
+    return userinfo_response(payload)
+
+
+def userinfo_response(payload: dict) -> dict:
+    response = {
         "sub": payload["sub"],
         "scope": payload.get("scope"),
         "iss": payload.get("iss"),
-    }
\ No newline at end of file
+    }
+
+    # OIDC profile claims, normally without touching Postgres
+    scopes = parse_scope(payload.get("scope"))
+    if "openid" in scopes:
+        claims = claims_cache.get(payload["sub"])
+        if claims is None:
+            raise HTTPException(status_code=401, detail="Unknown user")
+        response.update(claims_for_scope(claims, scopes))
+
+    return response
@@ -1,6 +1,9 @@
+from pathlib import Path
 from pydantic_settings import BaseSettings
 from typing import Optional
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 
 class Settings(BaseSettings):
 
@@ -11,19 +14,84 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: str = ""                 # comma-separated read replicas
+    DATABASE_REPLICA_PIN_SECONDS: float = 5.0       # read-your-writes window
+    DATABASE_REPLICA_EJECT_SECONDS: float = 30.0
+    DATABASE_SHARD_URLS: str = ""                   # comma-separated shards 1..N for sessions/tokens
+    DATABASE_CONNECT_TIMEOUT_SECONDS: int = 3       # libpq minimum is 2
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 2.0
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 5000
+    DATABASE_BREAKER_FAILURE_THRESHOLD: int = 5
+    DATABASE_BREAKER_RESET_SECONDS: float = 10.0
 
     # Redis
     
     REDIS_URL: Optional[str] = None
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.25
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.25
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_RESET_SECONDS: float = 5.0
+
+    # Session presence/revocation encoding in Redis
+    SESSION_STORE: str = "legacy"                   # "legacy" or "compact"
+    SESSION_STORE_BUCKET_BITS: int = 14             # keep sessions / 2**bits under ~100
+    SESSION_STORE_LEGACY_FALLBACK: bool = False     # read old keys while migrating
+    SESSION_STORE_FIELD_TTL: bool = False           # HEXPIRE, needs Redis >= 7.4
 
     # Security
     JWT_ALGORITHM: str = "RS256"
+    JWT_KEY_ID: str = "auth-server-key"
+    KEYS_DIR: str = str(PROJECT_ROOT / "keys")
     ACCESS_TOKEN_EXPIRE_SECONDS: int = 900          # 15 minutes
     REFRESH_TOKEN_EXPIRE_SECONDS: int = 2592000     # 30 days
 
+    # Password hashing (tune with scripts/calibrate_password_hash.py);
+    # older hashes are upgraded on the next successful login
+    PASSWORD_SCHEME: str = "bcrypt"                 # "bcrypt" or "argon2" (argon2id)
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_ARGON2_TIME_COST: int = 3
+    PASSWORD_ARGON2_MEMORY_KIB: int = 65536
+    PASSWORD_ARGON2_PARALLELISM: int = 4
+
     # OAuth
     ISSUER: str = "https://auth.example.com"
 
+    # In-process client cache (preloaded before workers fork)
+    CLIENT_REGISTRY_TTL_SECONDS: float = 60.0
+    CLIENT_REGISTRY_CHECK_SECONDS: float = 1.0     # version check in Redis; max staleness after invalidate()
+
+    # OIDC userinfo claims: per-process LRU in front of Redis
+    CLAIMS_CACHE_TTL_SECONDS: int = 3600
+    CLAIMS_CACHE_LOCAL_TTL_SECONDS: float = 5.0     # max staleness in other workers
+    CLAIMS_CACHE_LOCAL_SIZE: int = 10000
+
+    # Client credentials token reuse (shared across workers via Redis)
+    CLIENT_CREDENTIALS_CACHE_ENABLED: bool = False
+    CLIENT_CREDENTIALS_CACHE_REUSE_FRACTION: float = 0.5   # of token lifetime
+
+    # Audit trail (written in the background, never blocks a request)
+    AUDIT_ENABLED: bool = False
+    AUDIT_SINK: str = "jsonl"                       # "jsonl" or "postgres"
+    AUDIT_DIR: str = "audit"
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Lean ASGI handlers for /oauth/introspect and /userinfo/me (app/api/fastpath.py)
+    FASTPATH_ENABLED: bool = False
+
+    # Sampled capture of request shapes for load replay (scripts/replay_traffic.py)
+    CAPTURE_ENABLED: bool = False
+    CAPTURE_SAMPLE_RATE: float = 0.01
+    CAPTURE_DIR: str = "capture"
+
+    # Write-behind "last used" per session and client (app/services/activity.py)
+    ACTIVITY_ENABLED: bool = False
+    ACTIVITY_FLUSH_SECONDS: float = 30.0            # staleness window
+    ACTIVITY_MAX_KEYS: int = 100000                 # pending sessions + clients per worker
+    ACTIVITY_BATCH_SIZE: int = 1000                 # rows per UPSERT statement
+
     # Cookies (SSO)
     SESSION_COOKIE_NAME: str = "sso_session"
     SESSION_COOKIE_SECURE: bool = True
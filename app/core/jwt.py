@@ -1,34 +1,65 @@
+import base64
+import hashlib
 import jwt
 import time
-from jose import JWTError, ExpiredSignatureError
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.keys import keyring
 
-with open("keys/private.pem", "rb") as f:
-    PRIVATE_KEY = f.read()
 
-with open("keys/public.pem", "rb") as f:
-    PUBLIC_KEY = f.read()
-
-def create_access_token(subject, client_id, scope, session_id):
+def create_access_token(subject, client_id, scope, session_id=None):
     payload = {
         "sub": str(subject),
-        "sid": str(session_id),   # 🔥 SESSION BINDING
         "aud": client_id,
         "scope": scope,
         "iss": settings.ISSUER,
         "iat": int(time.time()),
         "exp": int(time.time()) + settings.ACCESS_TOKEN_EXPIRE_SECONDS,
     }
-    return jwt.encode(payload, PRIVATE_KEY, algorithm=settings.JWT_ALGORITHM)
+    # Client credentials tokens are not bound to a user session
+    if session_id is not None:
+        payload["sid"] = str(session_id)   # 🔥 SESSION BINDING
+    # kid lets resource servers pick the verification key from the JWKS
+    return jwt.encode(
+        payload,
+        keyring.private_key,
+        algorithm=settings.JWT_ALGORITHM,
+        headers={"kid": keyring.kid},
+    )
+
 
+def create_id_token(subject, client_id, access_token, nonce=None, session_id=None, auth_time=None):
+    """OIDC id_token, issued next to the access token of the code flow."""
+    now = int(time.time())
+    # at_hash: left half of the SHA-256 of the access token (RS256/ES256)
+    digest = hashlib.sha256(access_token.encode()).digest()
+    payload = {
+        "iss": settings.ISSUER,
+        "sub": str(subject),
+        "aud": client_id,
+        "iat": now,
+        "exp": now + settings.ACCESS_TOKEN_EXPIRE_SECONDS,
+        "at_hash": base64.urlsafe_b64encode(digest[: len(digest) // 2]).decode().rstrip("="),
+    }
+    if nonce:
+        payload["nonce"] = nonce
+    if session_id is not None:
+        payload["sid"] = str(session_id)
+    if auth_time is not None:
+        payload["auth_time"] = int(auth_time)
+    return jwt.encode(
+        payload,
+        keyring.private_key,
+        algorithm=settings.JWT_ALGORITHM,
+        headers={"kid": keyring.kid},
+    )
 
 
 def decode_token(token: str):
     try:
         return jwt.decode(
             token,
-            PUBLIC_KEY,
+            keyring.public_key,
             algorithms=[settings.JWT_ALGORITHM],
             issuer=settings.ISSUER,
             audience=None,  # we'll enforce client_id separately
@@ -37,12 +68,12 @@ def decode_token(token: str):
                 "require": ["exp", "iat", "sub"],
             },
         )
-    except ExpiredSignatureError:
+    except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired",
         )
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
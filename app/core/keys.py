@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+from app.core.config import settings
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+class Keyring:
+    """
+    Signing keys and the derived JWKS document.
+    Files are read on first use (or by load() during startup/preload),
+    never at import time.
+    """
+
+    def __init__(self, keys_dir: str, kid: str):
+        self.keys_dir = keys_dir
+        self.kid = kid
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self):
+        with self._lock:
+            if self._loaded:
+                return
+
+            with open(os.path.join(self.keys_dir, "private.pem"), "rb") as f:
+                self._private_key = f.read()
+            with open(os.path.join(self.keys_dir, "public.pem"), "rb") as f:
+                self._public_key = f.read()
+
+            numbers = load_pem_public_key(self._public_key).public_numbers()
+            jwks = {
+                "keys": [
+                    {
+                        "kty": "RSA",
+                        "use": "sig",
+                        "alg": "RS256",
+                        "kid": self.kid,
+                        "n": _b64url_uint(numbers.n),
+                        "e": _b64url_uint(numbers.e),
+                        "pem": self._public_key.decode(),  # kept for existing consumers
+                    }
+                ]
+            }
+            # The document only changes with the key, so it is encoded once
+            self._jwks_body = json.dumps(jwks, separators=(",", ":")).encode()
+            self._jwks_etag = '"' + hashlib.sha256(self._jwks_body).hexdigest()[:32] + '"'
+            self._loaded = True
+
+    def _get(self, name):
+        if not self._loaded:
+            self.load()
+        return getattr(self, name)
+
+    @property
+    def private_key(self) -> bytes:
+        return self._get("_private_key")
+
+    @property
+    def public_key(self) -> bytes:
+        return self._get("_public_key")
+
+    @property
+    def jwks_body(self) -> bytes:
+        return self._get("_jwks_body")
+
+    @property
+    def jwks_etag(self) -> str:
+        return self._get("_jwks_etag")
+
+
+keyring = Keyring(settings.KEYS_DIR, settings.JWT_KEY_ID)
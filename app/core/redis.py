@@ -1,10 +1,51 @@
+import os
 import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
 from app.core.config import settings
+from app.core.resilience import CircuitBreaker, GuardedRedis
+
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.REDIS_BREAKER_RESET_SECONDS,
+    errors=(redis.RedisError,),
+)
 
 redis_client = None
+redis_binary_client = None   # raw bytes, for compact binary encodings
+
+
+def reset_redis_pool():
+    for client in (redis_client, redis_binary_client):
+        if client:
+            client.connection_pool.reset()
+
+
+def close_redis():
+    for client in (redis_client, redis_binary_client):
+        if client:
+            client.connection_pool.disconnect()
+
+
+def _connect(decode_responses: bool) -> GuardedRedis:
+    return GuardedRedis(
+        redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=decode_responses,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+            # No client-side retries: a slow Redis must fail within one
+            # timeout and let the breaker take over
+            retry=Retry(NoBackoff(), 0),
+        ),
+        redis_breaker,
+    )
+
 
 if settings.REDIS_URL:
-    redis_client = redis.Redis.from_url(
-        settings.REDIS_URL,
-        decode_responses=True,
-    )
\ No newline at end of file
+    redis_client = _connect(decode_responses=True)
+    redis_binary_client = _connect(decode_responses=False)
+
+    # Connections inherited from the parent process are not ours to use
+    os.register_at_fork(after_in_child=reset_redis_pool)
@@ -0,0 +1,108 @@
+import threading
+import time
+
+
+class DependencyUnavailable(Exception):
+    """Raised when a backing service is down, slow, or its breaker is open."""
+
+    def __init__(self, dependency: str):
+        super().__init__(f"{dependency} unavailable")
+        self.dependency = dependency
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and then rejects
+    calls immediately for `reset_timeout` seconds. After that a single
+    trial call is let through (half-open); its outcome closes or re-opens
+    the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 5.0, errors=(Exception,)):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.errors = errors
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def is_open(self) -> bool:
+        """Open and not yet due for a trial call. Does not consume the trial."""
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def call(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise DependencyUnavailable(self.name)
+        try:
+            result = fn(*args, **kwargs)
+        except self.errors as exc:
+            self.record_failure()
+            raise DependencyUnavailable(self.name) from exc
+        self.record_success()
+        return result
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures}
+
+
+class GuardedRedis:
+    """Redis client proxy that runs every command through a circuit breaker."""
+
+    def __init__(self, client, breaker: CircuitBreaker):
+        self._client = client
+        self._breaker = breaker
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def guarded(*args, **kwargs):
+            return self._breaker.call(attr, *args, **kwargs)
+
+        return guarded
+
+    def pipeline(self, *args, **kwargs):
+        return _GuardedPipeline(self._client.pipeline(*args, **kwargs), self._breaker)
+
+
+class _GuardedPipeline:
+    # Commands are only buffered locally; the round trip happens in execute()
+
+    def __init__(self, pipeline, breaker: CircuitBreaker):
+        self._pipeline = pipeline
+        self._breaker = breaker
+
+    def __getattr__(self, name):
+        return getattr(self._pipeline, name)
+
+    def execute(self, *args, **kwargs):
+        return self._breaker.call(self._pipeline.execute, *args, **kwargs)
@@ -0,0 +1,279 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.db.sharding import Shards
+
+
+class ReplicaPool:
+    """
+    Read replicas in round-robin order. A replica whose connection fails
+    is ejected for eject_seconds and reads fall back to the others, or to
+    the primary when none is left.
+    """
+
+    def __init__(self, engines: List[Engine], eject_seconds: float = 30.0):
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._ejected_until = {}
+        self._cycle = itertools.cycle(range(len(self.engines))) if self.engines else None
+        self._lock = threading.Lock()
+
+        for engine in self.engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError):
+            self.eject(context.engine)
+
+    def eject(self, engine: Engine):
+        with self._lock:
+            self._ejected_until[engine] = time.monotonic() + self.eject_seconds
+
+    def is_healthy(self, engine: Engine) -> bool:
+        return self._ejected_until.get(engine, 0) <= time.monotonic()
+
+    def pick(self) -> Optional[Engine]:
+        if not self._cycle:
+            return None
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[next(self._cycle)]
+                if self.is_healthy(engine):
+                    return engine
+        return None
+
+
+class PrimaryPins:
+    """
+    Read-your-writes guard: after a write, the affected key (e.g. a session
+    id) is pinned to the primary for a few seconds, longer than replica lag.
+    Pins are kept locally and, when a Redis client is given, shared with
+    the other workers.
+    """
+
+    KEY = "oauth:primary_pin:{key}"
+
+    def __init__(self, seconds: float, redis_client=None):
+        self.seconds = seconds
+        self.redis = redis_client
+        self._local = {}
+
+    def pin(self, key):
+        key = str(key)
+        self._local[key] = time.monotonic() + self.seconds
+        if self.redis:
+            try:
+                self.redis.setex(self.KEY.format(key=key), max(1, int(self.seconds)), "1")
+            except Exception:
+                # Other workers may read a lagging replica; the local pin still holds
+                pass
+
+    def pin_many(self, keys):
+        """pin() for many keys with one Redis round trip."""
+        keys = [str(key) for key in keys]
+        until = time.monotonic() + self.seconds
+        for key in keys:
+            self._local[key] = until
+        if self.redis and keys:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.setex(self.KEY.format(key=key), max(1, int(self.seconds)), "1")
+            try:
+                pipe.execute()
+            except Exception:
+                pass
+
+    def is_pinned(self, key) -> bool:
+        key = str(key)
+        until = self._local.get(key)
+        if until is not None:
+            if until > time.monotonic():
+                return True
+            self._local.pop(key, None)
+        if self.redis:
+            try:
+                return bool(self.redis.exists(self.KEY.format(key=key)))
+            except Exception:
+                # Unknown pin state: the primary is always safe
+                return True
+        return False
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads inside read_replica() / read() to a replica.
+    Everything else goes to the primary, and once the session has written
+    anything all of its later reads stay on the primary too.
+
+    Sharded tables (sessions, refresh tokens, codes) are reached through
+    for_user() / for_session() / for_token(), which return the session of
+    the right shard. Those sessions are committed, rolled back and closed
+    together with this one; shard 0 is this session itself.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: ReplicaPool,
+        pins: PrimaryPins,
+        shards: Optional[Shards] = None,
+        shard: int = 0,
+        **kwargs,
+    ):
+        kwargs.pop("bind", None)
+        super().__init__(bind=primary, **kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self.pins = pins
+        self.shards = shards or Shards([primary])
+        self.shard = shard
+        self._shard_sessions = {}
+        self._use_replica = False
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._wrote = True
+            return self.primary
+
+        if self._use_replica and not self._wrote:
+            engine = self.replicas.pick()
+            if engine is not None:
+                return engine
+
+        return self.primary
+
+    @contextmanager
+    def read_replica(self, pin_key=None):
+        if pin_key is not None and self.pins.is_pinned(pin_key):
+            yield self
+            return
+
+        previous = self._use_replica
+        self._use_replica = True
+        try:
+            yield self
+        finally:
+            self._use_replica = previous
+
+    def read(self, query: Callable, pin_key=None):
+        """
+        Run a lookup on a replica. A miss or a replica failure is retried
+        on the primary, so rows written a moment ago are still found.
+        """
+        if not self.replicas.engines or self._wrote:
+            return query()
+        if pin_key is not None and self.pins.is_pinned(pin_key):
+            return query()
+
+        try:
+            with self.read_replica(pin_key):
+                result = query()
+        except exc.OperationalError:
+            self.rollback()
+            return query()
+
+        if result is None:
+            return query()
+        return result
+
+    def pin(self, key):
+        self.pins.pin(key)
+
+    def pin_many(self, keys):
+        self.pins.pin_many(keys)
+
+    # ------------------------
+    # Shards
+    # ------------------------
+
+    def for_shard(self, shard: int) -> "RoutingSession":
+        if shard == self.shard:
+            return self
+        session = self._shard_sessions.get(shard)
+        if session is None:
+            session = self._shard_sessions[shard] = self._open_shard(shard)
+        return session
+
+    def for_user(self, user_id) -> "RoutingSession":
+        """Where new rows of this user are written."""
+        return self.for_shard(self.shards.for_user(user_id))
+
+    def for_session(self, session_id) -> "RoutingSession":
+        return self.for_shard(self.shards.of_session(session_id))
+
+    def for_token(self, token: Optional[str]) -> "RoutingSession":
+        return self.for_shard(self.shards.of_token(token))
+
+    def new_session_id(self):
+        """Id for a session row stored on this shard."""
+        return self.shards.new_session_id(self.shard)
+
+    def new_token(self, nbytes: int) -> str:
+        """Refresh token or code for a row stored on this shard."""
+        return self.shards.new_token(self.shard, nbytes)
+
+    def each_shard(self, fn: Callable[["RoutingSession"], object]) -> list:
+        """
+        fn(session) on every shard, in parallel, each in its own
+        transaction committed when fn returns. For operations that cover
+        all of a user's rows, wherever they were written.
+        """
+        if self.shards.count == 1:
+            result = fn(self)
+            self.commit()
+            return [result]
+
+        def run(shard):
+            with self._open_shard(shard) as session:
+                result = fn(session)
+                session.commit()
+                return result
+
+        return self.shards.map(run, range(self.shards.count))
+
+    def _open_shard(self, shard: int) -> "RoutingSession":
+        self.shards.check(shard)
+        if shard == 0:
+            # Shard 0 is the primary database, with its replicas
+            primary, replicas = self.shards.engines[0], self.replicas
+        else:
+            primary, replicas = self.shards.engines[shard], ReplicaPool([])
+        return RoutingSession(
+            primary,
+            replicas,
+            self.pins,
+            shards=self.shards,
+            shard=shard,
+            autoflush=self.autoflush,
+        )
+
+    def commit(self):
+        # Not atomic across databases. Writes spanning the primary and a
+        # shard (a login that also rehashes the password) are independent.
+        for session in self._shard_sessions.values():
+            session.commit()
+        super().commit()
+
+    def rollback(self):
+        for session in self._shard_sessions.values():
+            session.rollback()
+        super().rollback()
+
+    def close(self):
+        for session in self._shard_sessions.values():
+            session.close()
+        self._shard_sessions.clear()
+        super().close()
+
+
+# Reads after a flush must see the flushed rows, so stay on the primary
+event.listen(RoutingSession, "after_flush", lambda session, ctx: setattr(session, "_wrote", True))
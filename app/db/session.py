@@ -1,15 +1,120 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.resilience import CircuitBreaker
+from app.db.routing import PrimaryPins, ReplicaPool, RoutingSession
+from app.db.sharding import Shards
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    future=True,
+
+def engine_options(url: str) -> dict:
+    """Bounded connect, pool checkout and statement times for every engine."""
+    options = {
+        "pool_pre_ping": True,
+        "future": True,
+    }
+    if url.startswith("postgresql"):
+        options["pool_timeout"] = settings.DATABASE_POOL_TIMEOUT_SECONDS
+        options["connect_args"] = {
+            "connect_timeout": settings.DATABASE_CONNECT_TIMEOUT_SECONDS,
+            "options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}",
+        }
+    return options
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+db_breaker = CircuitBreaker(
+    "database",
+    failure_threshold=settings.DATABASE_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.DATABASE_BREAKER_RESET_SECONDS,
+)
+
+
+def _is_connection_failure(context) -> bool:
+    return context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError)
+
+
+@event.listens_for(engine, "handle_error")
+def _record_db_failure(context):
+    if _is_connection_failure(context):
+        db_breaker.record_failure()
+
+
+@event.listens_for(engine, "checkout")
+def _record_db_success(dbapi_connection, connection_record, connection_proxy):
+    # Checkout runs after the pre-ping, so the primary answered
+    db_breaker.record_success()
+
+
+def watch_engine(engine, breaker: CircuitBreaker):
+    """The listeners above, for an engine with a breaker of its own."""
+
+    @event.listens_for(engine, "handle_error")
+    def record_failure(context):
+        if _is_connection_failure(context):
+            breaker.record_failure()
+
+    @event.listens_for(engine, "checkout")
+    def record_success(dbapi_connection, connection_record, connection_proxy):
+        breaker.record_success()
+
+
+replica_engines = [
+    create_engine(url.strip(), **engine_options(url.strip()))
+    for url in settings.DATABASE_REPLICA_URLS.split(",")
+    if url.strip()
+]
+
+# Shards 1..N for sessions, refresh tokens and codes; shard 0 is the primary
+shard_engines = [
+    create_engine(url.strip(), **engine_options(url.strip()))
+    for url in settings.DATABASE_SHARD_URLS.split(",")
+    if url.strip()
+]
+
+# One breaker per shard: a shard that is down fails fast (503) for the
+# requests that need it and leaves the others alone
+shard_breakers = [
+    CircuitBreaker(
+        f"database shard {n}",
+        failure_threshold=settings.DATABASE_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.DATABASE_BREAKER_RESET_SECONDS,
+    )
+    for n in range(1, len(shard_engines) + 1)
+]
+for shard_engine, breaker in zip(shard_engines, shard_breakers):
+    watch_engine(shard_engine, breaker)
+
+shards = Shards([engine, *shard_engines], breakers=[db_breaker, *shard_breakers])
+
+replicas = ReplicaPool(
+    replica_engines,
+    eject_seconds=settings.DATABASE_REPLICA_EJECT_SECONDS,
 )
 
+primary_pins = PrimaryPins(
+    settings.DATABASE_REPLICA_PIN_SECONDS,
+    redis_client=redis_client,
+)
+
+def dispose_engines(close: bool = True):
+    for e in [engine, *replica_engines, *shard_engines]:
+        e.dispose(close=close)
+
+
+# A forked worker must not share pooled connections with its parent.
+# close=False leaves the parent's sockets alone and just drops them here.
+os.register_at_fork(after_in_child=lambda: dispose_engines(close=False))
+
+
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine,
-)
\ No newline at end of file
+    primary=engine,
+    replicas=replicas,
+    pins=primary_pins,
+    shards=shards,
+)
@@ -0,0 +1,129 @@
+import secrets
+import threading
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import MetaData
+from sqlalchemy.engine import Engine
+
+from app.core.resilience import CircuitBreaker, DependencyUnavailable
+from app.db.base import Base
+
+# Partitioned by user; everything else lives on the primary only
+SHARDED_TABLES = ("user_sessions", "refresh_tokens", "authorization_codes", "session_activity")
+
+TOKEN_SEPARATOR = "."
+
+
+class Shards:
+    """
+    Databases holding the SHARDED_TABLES, partitioned by a hash of user_id.
+    Shard 0 is the primary database, which also holds every unsharded
+    table and all rows written before sharding was enabled.
+
+    Identifiers minted for new rows carry their shard, so a lookup by id
+    goes to exactly one database:
+
+        session id            UUIDv8, shard in the last byte
+        refresh token, code   "<shard>.<random>"
+
+    Ids without a shard (UUIDv4, unprefixed tokens) predate sharding and
+    resolve to shard 0. With a single database ids keep their old format.
+
+    breakers (one per engine, optional) make check() fail fast for a shard
+    whose database is down instead of waiting for connect timeouts.
+    """
+
+    def __init__(self, engines: List[Engine], breakers: Optional[List[CircuitBreaker]] = None):
+        if not 0 < len(engines) <= 256:
+            raise ValueError("between 1 and 256 shards are supported")
+        self.engines = list(engines)
+        self.breakers = list(breakers) if breakers else [None] * len(engines)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.engines)
+
+    def for_user(self, user_id) -> int:
+        """Home shard of a user: where their new rows are written."""
+        if self.count == 1:
+            return 0
+        return zlib.crc32(uuid.UUID(str(user_id)).bytes) % self.count
+
+    def check(self, shard: int):
+        breaker = self.breakers[shard]
+        if breaker and breaker.is_open():
+            raise DependencyUnavailable(breaker.name)
+
+    def of_session(self, session_id) -> int:
+        try:
+            sid = uuid.UUID(str(session_id))
+        except ValueError:
+            return 0
+        if sid.version != 8:
+            return 0
+        return self._checked(sid.bytes[15])
+
+    def of_token(self, token: Optional[str]) -> int:
+        prefix, sep, _ = (token or "").partition(TOKEN_SEPARATOR)
+        # JWTs contain dots too, but never start with digits
+        if not sep or not prefix.isdigit():
+            return 0
+        return self._checked(int(prefix))
+
+    def new_session_id(self, shard: int) -> uuid.UUID:
+        if self.count == 1:
+            return uuid.uuid4()
+        raw = bytearray(secrets.token_bytes(16))
+        # The leading bytes stay random: CompactSessionStore buckets by them
+        raw[15] = shard
+        raw[6] = (raw[6] & 0x0F) | 0x80     # version 8
+        raw[8] = (raw[8] & 0x3F) | 0x80     # RFC 4122 variant
+        return uuid.UUID(bytes=bytes(raw))
+
+    def new_token(self, shard: int, nbytes: int) -> str:
+        token = secrets.token_urlsafe(nbytes)
+        if self.count == 1:
+            return token
+        return f"{shard}{TOKEN_SEPARATOR}{token}"
+
+    def map(self, fn: Callable[[int], object], shards: Iterable[int]) -> list:
+        """fn(shard) for every shard in parallel, results in shard order."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.count, thread_name_prefix="shard"
+                )
+        return list(self._executor.map(fn, shards))
+
+    def _checked(self, shard: int) -> int:
+        # A forged or foreign id: look on the primary, where it won't be found
+        return shard if shard < self.count else 0
+
+
+def create_shard_schema(engine: Engine):
+    """
+    Create the sharded tables on a shard database (1..N). Foreign keys to
+    tables that only exist on the primary (users, oauth_clients) are left
+    out; those between sharded tables are kept, a user's rows are always
+    on the same shard.
+    """
+    # Register the models on Base.metadata
+    import app.models.activity, app.models.session, app.models.token  # noqa: F401
+
+    metadata = MetaData()
+    tables = [Base.metadata.tables[name].to_metadata(metadata) for name in SHARDED_TABLES]
+
+    for table in tables:
+        for constraint in list(table.foreign_key_constraints):
+            if constraint.elements[0].target_fullname.split(".")[0] not in SHARDED_TABLES:
+                table.constraints.discard(constraint)
+                for fk in constraint.elements:
+                    fk.parent.foreign_keys.discard(fk)
+                    table.foreign_keys.discard(fk)
+
+    metadata.create_all(engine)
@@ -1,25 +1,136 @@
-from fastapi import FastAPI
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.api.fastpath import FastPathMiddleware
 from app.api.router import api_router
 from app.core.config import settings
+from app.core.keys import keyring
+from app.core.redis import redis_breaker, close_redis
+from app.core.resilience import DependencyUnavailable
+from app.db.session import SessionLocal, db_breaker, dispose_engines, shard_breakers
+from app.services.activity import activity
+from app.services.audit import audit
+from app.services.capture import CaptureMiddleware, capture
+from app.services.client_registry import client_registry
+
+
+def preload(load_clients: bool = True):
+    """
+    Read-only state every worker needs. The multi-worker runner calls this
+    once before forking so the data is shared copy-on-write.
+    """
+    keyring.load()
+
+    if load_clients:
+        db = SessionLocal()
+        try:
+            client_registry.load_all(db)
+        finally:
+            db.close()
+
+
+# Engines, Redis pools, keyring, client registry and the background
+# pipelines are process-wide and shared by every app create_app() builds:
+# the first app to start brings them up, the last one to stop tears them down.
+_running_apps = 0
+_running_lock = threading.Lock()
+
+
+def start_resources():
+    # No-op for keys already loaded by the runner; clients are loaded lazily
+    preload(load_clients=False)
+    if settings.AUDIT_ENABLED:
+        audit.start()
+    if settings.CAPTURE_ENABLED:
+        capture.start()
+    if settings.ACTIVITY_ENABLED:
+        activity.start()
+
+
+def stop_resources():
+    activity.stop()
+    capture.stop()
+    audit.stop()
+    dispose_engines()
+    close_redis()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _running_apps
+
+    with _running_lock:
+        _running_apps += 1
+        if _running_apps == 1:
+            start_resources()
+    try:
+        yield
+    finally:
+        with _running_lock:
+            _running_apps -= 1
+            if _running_apps == 0:
+                stop_resources()
+
+
+def dependency_unavailable(request: Request, exc: DependencyUnavailable):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "5"},
+    )
 
-app = FastAPI(
-    title="OAuth 2.0 & SSO Authorization Server",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
 
-@app.get("/")
 def root():
     return {"status": "running"}
 
 
-app.include_router(api_router, prefix="/api/v1")
-
-@app.get("/health")
 def health_check():
     return {
         "status": "ok",
         "service": "auth-server",
-        "environment": settings.ENVIRONMENT
-    }
\ No newline at end of file
+        "environment": settings.ENVIRONMENT,
+        "audit": audit.stats(),
+        "activity": activity.stats(),
+        "breakers": {
+            "redis": redis_breaker.stats(),
+            "database": db_breaker.stats(),
+            "database_shards": [b.stats() for b in shard_breakers],
+        },
+    }
+
+
+def create_app() -> FastAPI:
+    """
+    A new application: its own routes, middleware and exception handlers.
+    Resources are shared with every other app in the process (see above).
+    """
+    app = FastAPI(
+        title="OAuth 2.0 & SSO Authorization Server",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan,
+    )
+
+    app.add_exception_handler(DependencyUnavailable, dependency_unavailable)
+
+    # Added first so it sits inside the capture middleware
+    if settings.FASTPATH_ENABLED:
+        app.add_middleware(FastPathMiddleware, router=app.router)
+
+    if settings.CAPTURE_ENABLED:
+        app.add_middleware(
+            CaptureMiddleware,
+            pipeline=capture,
+            sample_rate=settings.CAPTURE_SAMPLE_RATE,
+        )
+
+    app.get("/")(root)
+    app.include_router(api_router, prefix="/api/v1")
+    app.get("/health")(health_check)
+
+    return app
+
+
+app = create_app()
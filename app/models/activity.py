@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+# Written in batches by app.services.activity, never per request
+
+class SessionActivity(Base):
+    __tablename__ = "session_activity"
+
+    # No foreign key: stored on the session's shard, kept after it expires
+    session_id = Column(UUID(as_uuid=True), primary_key=True)
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+    use_count = Column(BigInteger, nullable=False, default=0)
+
+
+class ClientActivity(Base):
+    __tablename__ = "client_activity"
+
+    client_id = Column(String(64), primary_key=True)   # public client_id
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+    use_count = Column(BigInteger, nullable=False, default=0)
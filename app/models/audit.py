@@ -0,0 +1,17 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.db.base import Base
+
+
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    ts = Column(DateTime(timezone=True), nullable=False, index=True)
+    event = Column(String(64), nullable=False)
+
+    client_id = Column(String(64), nullable=True)
+    user_id = Column(UUID, nullable=True, index=True)
+    session_id = Column(UUID, nullable=True)
+
+    data = Column(JSONB, nullable=True)
@@ -15,4 +15,7 @@ class OAuthClient(Base):
     allowed_grant_types = Column(ARRAY(String), nullable=False)
     allowed_scopes = Column(ARRAY(String), nullable=False)
 
-    is_confidential = Column(Boolean, default=True)
\ No newline at end of file
+    is_confidential = Column(Boolean, default=True)
+
+    # "jwt" (self-contained RS256) or "reference" (opaque, claims in Redis)
+    access_token_format = Column(String(16), nullable=False, default="jwt", server_default="jwt")
\ No newline at end of file
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -13,4 +13,18 @@ class UserSession(Base):
     user_id = Column(UUID, ForeignKey("users.id"), nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    expires_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    expires_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Covers the device list: active sessions of one user in keyset
+        # order, expiry read from the index (index-only scan)
+        Index(
+            "ix_user_sessions_user_active",
+            "user_id",
+            created_at.desc(),
+            id.desc(),
+            postgresql_include=["expires_at"],
+            postgresql_where=is_active == True,
+            sqlite_where=is_active == True,
+        ),
+    )
@@ -9,12 +9,17 @@ class AuthorizationCode(Base):
     code = Column(String(128), primary_key=True)
     client_id = Column(UUID, ForeignKey("oauth_clients.id"))
     user_id = Column(UUID, ForeignKey("users.id"))
+    # The SSO session that authorized the code; tokens are bound to it
+    session_id = Column(UUID, ForeignKey("user_sessions.id"), nullable=True)
     redirect_uri = Column(String)
     scope = Column(String)
 
     code_challenge = Column(String, nullable=True)
     code_challenge_method = Column(String, nullable=True)
 
+    # OIDC: echoed in the id_token to bind it to the authentication request
+    nonce = Column(String, nullable=True)
+
     expires_at = Column(DateTime)
 
 class RefreshToken(Base):
@@ -13,4 +13,13 @@ class User(Base):
     password_hash = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    # OIDC standard claims (served by /userinfo/me through the claims cache)
+    email_verified = Column(Boolean, nullable=False, default=False, server_default="false")
+    name = Column(String(255), nullable=True)
+    given_name = Column(String(255), nullable=True)
+    family_name = Column(String(255), nullable=True)
+    picture = Column(String, nullable=True)
+    locale = Column(String(16), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,112 @@
+"""
+Pre-forking production runner.
+
+    python -m app.runner --workers 4 --port 8000
+
+The master process loads the application, signing keys and client registry
+once, binds the listening socket, then forks the workers. Read-only state
+is shared copy-on-write; database and Redis connections are re-created in
+each worker by the at-fork hooks in app.db.session and app.core.redis.
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(app, sock: socket.socket, args):
+    config = uvicorn.Config(
+        app,
+        log_level=args.log_level,
+        access_log=False,
+        timeout_keep_alive=args.keep_alive,
+    )
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def _spawn(app, sock, args) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            _serve(app, sock, args)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the OAuth server with pre-forked workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--keep-alive", type=int, default=5)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-preload-clients", action="store_true")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    from app.main import app, preload
+
+    preload(load_clients=not args.no_preload_clients)
+    print(f"[runner] app loaded in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+
+    # Move everything allocated so far out of the GC's reach so collections
+    # in the workers don't touch (and un-share) the preloaded pages
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(args.host, args.port)
+    workers = {_spawn(app, sock, args) for _ in range(args.workers)}
+    print(f"[runner] {len(workers)} workers on {args.host}:{args.port}", file=sys.stderr)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        workers.discard(pid)
+        if not stopping:
+            # A worker died on its own: replace it
+            print(f"[runner] worker {pid} exited ({status}), restarting", file=sys.stderr)
+            workers.add(_spawn(app, sock, args))
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Resource server SDK: validate access tokens issued by this server locally,
+using cached JWKS keys and the revocation feed.
+
+    validator = TokenValidator.for_server(
+        "https://auth.example.com/api/v1",
+        issuer="https://auth.example.com",
+        client_id="orders-api",
+        client_secret="...",
+    )
+    validator.revocations.start()
+    claims = validator.validate(token)
+"""
+
+from app.sdk.jwks import JWKSCache
+from app.sdk.revocation import RevocationFeed, sid_digest
+from app.sdk.transport import HTTPResponse, urllib_get
+from app.sdk.validator import InvalidToken, TokenValidator
+
+__all__ = [
+    "HTTPResponse",
+    "InvalidToken",
+    "JWKSCache",
+    "RevocationFeed",
+    "TokenValidator",
+    "sid_digest",
+    "urllib_get",
+]
@@ -0,0 +1,71 @@
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+import jwt
+
+from app.sdk.transport import HTTPGet, urllib_get
+
+
+class JWKSCache:
+    """
+    In-memory signing keys of the authorization server, keyed by kid.
+    Refreshes revalidate with If-None-Match, so an unchanged key set
+    costs a 304 with no body.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        http_get: HTTPGet = urllib_get,
+        min_refresh_interval: float = 60.0,
+    ):
+        self.jwks_url = jwks_url
+        self.http_get = http_get
+        self.min_refresh_interval = min_refresh_interval
+
+        self._keys: Dict[str, object] = {}
+        self._etag: Optional[str] = None
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        headers = {"Accept": "application/json"}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+
+        response = self.http_get(self.jwks_url, headers)
+        self._last_refresh = time.monotonic()
+
+        if response.status == 304:
+            return
+        if response.status != 200:
+            raise RuntimeError(f"JWKS fetch failed with HTTP {response.status}")
+
+        keys = {}
+        for jwk in json.loads(response.body)["keys"]:
+            if jwk.get("kty") == "RSA" and "n" in jwk:
+                keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+
+        self._keys = keys
+        self._etag = response.headers.get("etag")
+
+    def get_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid usually means the server rotated its key. Refresh,
+        # but not more than once per interval so garbage kids can't be
+        # used to hammer the server.
+        with self._lock:
+            key = self._keys.get(kid)
+            if key is None and (
+                time.monotonic() - self._last_refresh >= self.min_refresh_interval
+                or not self._keys
+            ):
+                self.refresh()
+                key = self._keys.get(kid)
+
+        return key
@@ -0,0 +1,121 @@
+import base64
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from app.sdk.transport import HTTPGet, urllib_get
+
+
+def sid_digest(sid) -> str:
+    """
+    How the feed names a revoked session. A session id is also the value
+    of the SSO cookie, so only this one-way digest is ever published.
+    """
+    return hashlib.sha256(str(sid).encode()).hexdigest()
+
+
+def basic_auth(client_id: str, client_secret: str) -> str:
+    # RFC 6749 2.3.1: form-urlencode both parts before base64
+    raw = f"{quote(client_id, safe='')}:{quote(client_secret, safe='')}"
+    return "Basic " + base64.b64encode(raw.encode()).decode()
+
+
+class RevocationFeed:
+    """
+    Local copy of the server's revoked sessions, as sid digests.
+    Polls /oauth/revocations with a cursor, so each poll only transfers
+    entries published since the previous one. The feed requires the
+    credentials of a confidential client.
+    """
+
+    def __init__(
+        self,
+        feed_url: str,
+        http_get: HTTPGet = urllib_get,
+        poll_interval: float = 2.0,
+        batch_size: int = 1000,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+    ):
+        self.feed_url = feed_url
+        self.http_get = http_get
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+
+        self.headers = {"Accept": "application/json"}
+        if client_id and client_secret:
+            self.headers["Authorization"] = basic_auth(client_id, client_secret)
+
+        self.cursor = "0"
+        self.last_success = 0.0
+        self._revoked: Dict[str, int] = {}   # sid digest -> exp
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self) -> int:
+        """Fetch new entries until caught up. Returns the number received."""
+        received = 0
+        while True:
+            url = f"{self.feed_url}?since={self.cursor}&limit={self.batch_size}"
+            response = self.http_get(url, self.headers)
+            if response.status != 200:
+                raise RuntimeError(f"Revocation feed failed with HTTP {response.status}")
+
+            data = json.loads(response.body)
+            for entry in data["revoked"]:
+                self._revoked[entry["sid_sha256"]] = entry["exp"]
+            self.cursor = data["cursor"]
+            received += len(data["revoked"])
+
+            if len(data["revoked"]) < self.batch_size:
+                break
+
+        self.last_success = time.monotonic()
+        self._prune()
+        return received
+
+    def _prune(self):
+        now = int(time.time())
+        for digest in [d for d, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[digest]
+
+    def staleness(self) -> float:
+        """Seconds since the feed was last known to be up to date."""
+        if not self.last_success:
+            return float("inf")
+        return time.monotonic() - self.last_success
+
+    def is_revoked(self, sid: str) -> bool:
+        exp = self._revoked.get(sid_digest(sid))
+        return exp is not None and exp > time.time()
+
+    # ------------------------
+    # Background subscription
+    # ------------------------
+
+    def start(self):
+        if self._thread:
+            return
+        self.poll()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="revocation-feed", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception:
+                # Keep the last known state; the next poll resumes from the cursor
+                pass
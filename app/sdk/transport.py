@@ -0,0 +1,31 @@
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, NamedTuple
+
+
+class HTTPResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+# (url, request headers) -> HTTPResponse. Tests plug in an in-process client.
+HTTPGet = Callable[[str, Dict[str, str]], HTTPResponse]
+
+
+def urllib_get(url: str, headers: Dict[str, str], timeout: float = 5.0) -> HTTPResponse:
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return HTTPResponse(
+                response.status,
+                {k.lower(): v for k, v in response.headers.items()},
+                response.read(),
+            )
+    except urllib.error.HTTPError as exc:
+        # 304 Not Modified and errors arrive as exceptions
+        return HTTPResponse(
+            exc.code,
+            {k.lower(): v for k, v in exc.headers.items()},
+            exc.read(),
+        )
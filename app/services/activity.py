@@ -0,0 +1,214 @@
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+from app.models.activity import ClientActivity, SessionActivity
+
+
+# ------------------------
+# Sink
+# ------------------------
+
+class DatabaseActivitySink:
+    """
+    Writes a flush as batched UPSERTs: use counts are added to the stored
+    ones and last_used_at keeps the later value, so every worker can
+    flush its own counts independently. Session rows go to the session's
+    shard, client rows to the primary.
+
+    Each database is committed on its own (RoutingSession.commit is not
+    atomic across them), and write() returns the sessions and clients of
+    the databases that failed so that only those are retried.
+    """
+
+    def __init__(self, session_factory, batch_size: int):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    def write(self, sessions: dict, clients: dict):
+        failed_sessions, failed_clients = {}, {}
+        db = self.session_factory()
+        try:
+            by_shard = defaultdict(dict)
+            for sid, entry in sessions.items():
+                by_shard[db.shards.of_session(sid)][sid] = entry
+            if clients:
+                # Client rows are written with shard 0, the primary
+                by_shard.setdefault(0, {})
+
+            for shard, entries in sorted(by_shard.items()):
+                shard_db = db.for_shard(shard)
+                try:
+                    self._upsert(
+                        shard_db,
+                        SessionActivity,
+                        "session_id",
+                        {uuid.UUID(sid): entry for sid, entry in entries.items()},
+                    )
+                    if shard == 0:
+                        self._upsert(shard_db, ClientActivity, "client_id", clients)
+                    shard_db.commit()
+                except Exception:
+                    shard_db.rollback()
+                    failed_sessions.update(entries)
+                    if shard == 0:
+                        failed_clients = clients
+        finally:
+            db.close()
+        return failed_sessions, failed_clients
+
+    def close(self):
+        pass
+
+    def _upsert(self, db, model, key: str, entries: dict):
+        table = model.__table__
+        dialect = postgresql if db.primary.dialect.name == "postgresql" else sqlite
+
+        # Same key order in every worker, so concurrent flushes can't deadlock
+        rows = [
+            {
+                key: k,
+                "last_used_at": datetime.fromtimestamp(last_used, timezone.utc),
+                "use_count": count,
+            }
+            for k, (last_used, count) in sorted(entries.items())
+        ]
+        for start in range(0, len(rows), self.batch_size):
+            stmt = dialect.insert(table).values(rows[start:start + self.batch_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={
+                    "last_used_at": case(
+                        (stmt.excluded.last_used_at > table.c.last_used_at, stmt.excluded.last_used_at),
+                        else_=table.c.last_used_at,
+                    ),
+                    "use_count": table.c.use_count + stmt.excluded.use_count,
+                },
+            )
+            db.execute(stmt)
+
+
+# ------------------------
+# Tracker
+# ------------------------
+
+class ActivityTracker:
+    """
+    Coalesces per-session and per-client activity in memory and writes it
+    behind, every flush_interval seconds, from a background thread.
+    record() is O(1): two dict updates under a lock, no I/O. Stored values
+    are at most flush_interval (plus one write) stale.
+
+    At most max_keys sessions and clients are pending at once; activity of
+    further keys is dropped and counted. Entries the sink could not write
+    are kept for the next flush within the same limit.
+    """
+
+    def __init__(self, sink_factory, flush_interval: float, max_keys: int):
+        self.sink_factory = sink_factory
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+
+        self._sessions = {}     # session id -> [last used (epoch), count]
+        self._clients = {}      # client_id  -> [last used (epoch), count]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    def record(self, session_id, client_id):
+        if not self._thread:
+            return
+
+        now = time.time()
+        with self._lock:
+            if session_id:
+                self._bump(self._sessions, str(session_id), now, 1)
+            if client_id:
+                self._bump(self._clients, client_id, now, 1)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "pending": len(self._sessions) + len(self._clients),
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._sink = self.sink_factory()
+        self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._sink.close()
+
+    def flush(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+            clients, self._clients = self._clients, {}
+        if not sessions and not clients:
+            return
+
+        try:
+            failed_sessions, failed_clients = self._sink.write(sessions, clients)
+        except Exception:
+            failed_sessions, failed_clients = sessions, clients
+
+        failed = len(failed_sessions) + len(failed_clients)
+        self.written += len(sessions) + len(clients) - failed
+        if not failed:
+            return
+
+        # Database unavailable: keep its counts for the next flush
+        self.failed += failed
+        with self._lock:
+            for pending, entries in ((self._sessions, failed_sessions), (self._clients, failed_clients)):
+                for key, (last_used, count) in entries.items():
+                    self._bump(pending, key, last_used, count)
+
+    def _bump(self, pending: dict, key, last_used: float, count: int):
+        entry = pending.get(key)
+        if entry is not None:
+            entry[0] = max(entry[0], last_used)
+            entry[1] += count
+        elif len(self._sessions) + len(self._clients) < self.max_keys:
+            pending[key] = [last_used, count]
+        else:
+            self.dropped += count
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+        # Final flush on shutdown
+        self.flush()
+
+
+def _sink_factory():
+    from app.db.session import SessionLocal
+    return DatabaseActivitySink(SessionLocal, settings.ACTIVITY_BATCH_SIZE)
+
+
+activity = ActivityTracker(
+    _sink_factory,
+    flush_interval=settings.ACTIVITY_FLUSH_SECONDS,
+    max_keys=settings.ACTIVITY_MAX_KEYS,
+)
@@ -0,0 +1,224 @@
+import csv
+import glob
+import gzip
+import io
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.core.config import settings
+
+
+# ------------------------
+# Sinks
+# ------------------------
+
+class JsonlSink:
+    """
+    Appends events to <prefix>-<pid>-current.jsonl. Once the segment grows
+    past max_bytes it is renamed with a timestamp and gzip-compressed.
+    Every worker process writes and rotates its own files, so a rotation
+    never pulls a file from under another worker. Current files left by
+    processes that have exited (a restarted or killed worker) are rotated
+    by the next sink to start.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, prefix: str = "audit"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prefix = f"{prefix}-{os.getpid()}"
+        self.path = os.path.join(directory, f"{self.prefix}-current.jsonl")
+        os.makedirs(directory, exist_ok=True)
+        self._rotate_orphans(prefix)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, events):
+        self._file.write(
+            "".join(json.dumps(e, separators=(",", ":"), default=str) + "\n" for e in events)
+        )
+        self._file.flush()
+
+        if self._file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        self._file.close()
+        self._compress(self.path, self.prefix)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _compress(self, path: str, prefix: str):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        segment = os.path.join(self.directory, f"{prefix}-{stamp}.jsonl")
+        os.replace(path, segment)
+
+        if os.path.getsize(segment):
+            with open(segment, "rb") as src, gzip.open(segment + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        os.remove(segment)
+
+    def _rotate_orphans(self, prefix: str):
+        suffix = "-current.jsonl"
+        for path in glob.glob(os.path.join(self.directory, f"{prefix}-*{suffix}")):
+            pid = os.path.basename(path)[len(prefix) + 1:-len(suffix)]
+            if not pid.isdigit() or _pid_alive(int(pid)):
+                continue
+            try:
+                self._compress(path, f"{prefix}-{pid}")
+            except FileNotFoundError:
+                # Another worker starting at the same time got there first
+                pass
+
+    def close(self):
+        self._file.close()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PostgresCopySink:
+    """Writes each batch to audit_events with a single COPY."""
+
+    COLUMNS = ("ts", "event", "client_id", "user_id", "session_id", "data")
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def write(self, events):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for e in events:
+            extra = {k: v for k, v in e.items() if k not in self.COLUMNS}
+            writer.writerow([
+                datetime.fromtimestamp(e["ts"], timezone.utc).isoformat(),
+                e["event"],
+                e.get("client_id") or "",
+                e.get("user_id") or "",
+                e.get("session_id") or "",
+                json.dumps(extra, default=str) if extra else "",
+            ])
+        buffer.seek(0)
+
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY audit_events ({', '.join(self.COLUMNS)}) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def close(self):
+        pass
+
+
+# ------------------------
+# Pipeline
+# ------------------------
+
+class AuditPipeline:
+    """
+    Bounded in-memory queue fed from request handlers and drained in
+    batches by a background thread. emit() never blocks: when the queue
+    is full the event is dropped and counted.
+    """
+
+    def __init__(self, sink_factory, max_queue: int, batch_size: int, flush_interval: float):
+        self.sink_factory = sink_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    def emit(self, event: str, **fields):
+        if not self._thread:
+            return
+
+        fields["ts"] = time.time()
+        fields["event"] = event
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._sink = self.sink_factory()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._sink.close()
+
+    def _run(self):
+        # Keep draining after stop() until the queue is empty
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._sink.write(batch)
+                self.written += len(batch)
+            except Exception:
+                # A failing sink must not stop the pipeline
+                self.failed += len(batch)
+
+
+def _sink_factory():
+    if settings.AUDIT_SINK == "postgres":
+        from app.db.session import engine
+        return PostgresCopySink(engine)
+    return JsonlSink(settings.AUDIT_DIR, settings.AUDIT_SEGMENT_MAX_BYTES)
+
+
+audit = AuditPipeline(
+    _sink_factory,
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
@@ -0,0 +1,89 @@
+import random
+import time
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from app.core.config import settings
+from app.services.audit import AuditPipeline, JsonlSink
+
+
+# Parameters whose values describe the shape of a request and carry no
+# secret. Everything else (codes, tokens, secrets, verifiers, e-mails,
+# redirect URIs) is recorded by name only.
+SHAPE_VALUES = {"grant_type", "response_type", "scope", "code_challenge_method", "token_type_hint"}
+
+FORM_CONTENT_TYPE = b"application/x-www-form-urlencoded"
+MAX_FORM_BYTES = 64 * 1024
+
+
+def request_shape(raw: bytes) -> Optional[dict]:
+    if not raw:
+        return None
+    shape = {}
+    for name, value in parse_qsl(raw.decode("latin-1"), keep_blank_values=True):
+        shape[name] = value if name in SHAPE_VALUES else None
+    return shape
+
+
+class CaptureMiddleware:
+    """
+    Records a sample of requests as anonymized shapes: arrival time,
+    endpoint template (never the raw path, which may hold ids), parameter
+    names, status and duration. Writing goes through a background
+    pipeline, so the request only pays for a few dict operations.
+    """
+
+    def __init__(self, app, pipeline: AuditPipeline, sample_rate: float):
+        self.app = app
+        self.pipeline = pipeline
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        arrival = time.time()
+        started = time.perf_counter()
+        headers = dict(scope["headers"])
+        is_form = headers.get(b"content-type", b"").startswith(FORM_CONTENT_TYPE)
+        body = bytearray()
+        status = 500
+
+        async def capture_receive():
+            # Copy the form body as the application reads it
+            message = await receive()
+            if is_form and message["type"] == "http.request" and len(body) < MAX_FORM_BYTES:
+                body.extend(message.get("body", b""))
+            return message
+
+        async def capture_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            route = scope.get("route")
+            self.pipeline.emit(
+                "request",
+                arrival=arrival,
+                method=scope["method"],
+                endpoint=getattr(route, "path", "unmatched"),
+                query=request_shape(scope["query_string"]),
+                form=request_shape(bytes(body)),
+                session_cookie=settings.SESSION_COOKIE_NAME.encode() in headers.get(b"cookie", b""),
+                bearer=headers.get(b"authorization", b"").lower().startswith(b"bearer "),
+                status=status,
+                duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            )
+
+
+capture = AuditPipeline(
+    lambda: JsonlSink(settings.CAPTURE_DIR, settings.AUDIT_SEGMENT_MAX_BYTES, prefix="capture"),
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
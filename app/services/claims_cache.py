@@ -0,0 +1,188 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.resilience import DependencyUnavailable
+from app.models.user import User
+
+
+CLAIMS_KEY = "oauth:claims:{user_id}"
+
+# OIDC claims served per scope (OpenID Connect Core 5.4)
+SCOPE_CLAIMS = {
+    "profile": ("name", "given_name", "family_name", "picture", "locale", "updated_at"),
+    "email": ("email", "email_verified"),
+}
+CLAIM_COLUMNS = {"email", "email_verified", "name", "given_name", "family_name", "picture", "locale"}
+
+
+def user_claims(user: User) -> dict:
+    return {
+        "sub": str(user.id),
+        "email": user.email,
+        "email_verified": bool(user.email_verified),
+        "name": user.name,
+        "given_name": user.given_name,
+        "family_name": user.family_name,
+        "picture": user.picture,
+        "locale": user.locale,
+        "updated_at": int(user.updated_at.timestamp()) if user.updated_at else None,
+    }
+
+
+def claims_for_scope(claims: dict, scopes) -> dict:
+    """Only the claims the granted scopes release, without empty values."""
+    released = {}
+    for scope, names in SCOPE_CLAIMS.items():
+        if scope in scopes:
+            released.update((n, claims[n]) for n in names if claims.get(n) is not None)
+    return released
+
+
+def _load_from_db(user_id) -> Optional[dict]:
+    from app.db.session import SessionLocal
+
+    try:
+        user_id = uuid.UUID(user_id)
+    except ValueError:
+        # e.g. the client_id subject of a client credentials token
+        return None
+
+    db = SessionLocal()
+    try:
+        user = db.read(
+            lambda: db.query(User).filter_by(id=user_id, is_active=True).first(),
+            pin_key=f"user:{user_id}",
+        )
+        return user_claims(user) if user else None
+    finally:
+        db.close()
+
+
+class ClaimsCache:
+    """
+    Two levels: a small per-process LRU in front of Redis. Redis is the
+    shared copy and is invalidated on every user update; the local level
+    is only trusted for local_ttl seconds, which bounds how long another
+    worker can serve claims from before an update.
+    """
+
+    def __init__(self, ttl: int, local_ttl: float, local_size: int, loader=_load_from_db):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local_size = local_size
+        self.loader = loader
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id) -> Optional[dict]:
+        user_id = str(user_id)
+
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry and entry[0] > time.monotonic():
+                self._local.move_to_end(user_id)
+                return entry[1]
+
+        claims = self._get_shared(user_id)
+        if claims is None:
+            claims = self.loader(user_id)
+            if claims is None:
+                return None
+            self._set_shared(user_id, claims)
+
+        self._set_local(user_id, claims)
+        return claims
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            self._local.pop(user_id, None)
+        if redis_client:
+            redis_client.delete(CLAIMS_KEY.format(user_id=user_id))
+
+    # ------------------------
+
+    def _set_local(self, user_id, claims):
+        with self._lock:
+            self._local[user_id] = (time.monotonic() + self.local_ttl, claims)
+            self._local.move_to_end(user_id)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _get_shared(self, user_id) -> Optional[dict]:
+        if not redis_client:
+            return None
+        try:
+            raw = redis_client.get(CLAIMS_KEY.format(user_id=user_id))
+        except DependencyUnavailable:
+            # The cache is an optimization, read the database instead
+            return None
+        return json.loads(raw) if raw else None
+
+    def _set_shared(self, user_id, claims):
+        if not redis_client:
+            return
+        try:
+            redis_client.setex(
+                CLAIMS_KEY.format(user_id=user_id),
+                self.ttl,
+                json.dumps(claims, separators=(",", ":")),
+            )
+        except DependencyUnavailable:
+            pass
+
+
+claims_cache = ClaimsCache(
+    ttl=settings.CLAIMS_CACHE_TTL_SECONDS,
+    local_ttl=settings.CLAIMS_CACHE_LOCAL_TTL_SECONDS,
+    local_size=settings.CLAIMS_CACHE_LOCAL_SIZE,
+)
+
+
+# ------------------------
+# Invalidation on user updates
+# ------------------------
+
+@event.listens_for(User, "after_update")
+def _claims_changed(mapper, connection, user):
+    state = inspect(user)
+    if any(state.attrs[c].history.has_changes() for c in CLAIM_COLUMNS | {"is_active"}):
+        session = state.session
+        if session is not None:
+            session.info.setdefault("claims_changed", set()).add(str(user.id))
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, user):
+    session = inspect(user).session
+    if session is not None:
+        session.info.setdefault("claims_changed", set()).add(str(user.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Only once the change is durable: invalidating earlier would let a
+    # concurrent miss re-cache the row as it was before the update
+    for user_id in session.info.pop("claims_changed", ()):
+        # The reload must not come from a replica that hasn't caught up
+        if hasattr(session, "pin"):
+            session.pin(f"user:{user_id}")
+        try:
+            claims_cache.invalidate(user_id)
+        except DependencyUnavailable:
+            # Redis copy expires after ttl; nothing better to do here
+            pass
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("claims_changed", None)
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional
+
+
+@lru_cache(maxsize=4096)
+def parse_scope(scope: Optional[str]) -> FrozenSet[str]:
+    """
+    Scope string -> set of scopes. Tokens carry a handful of distinct scope
+    strings, so after the first request this is a cache hit.
+    """
+    return frozenset((scope or "").split())
+
+
+def normalize_scope(scope: Optional[str]) -> str:
+    """Canonical form used for issued tokens: de-duplicated and sorted."""
+    return " ".join(sorted(parse_scope(scope)))
+
+
+@dataclass(frozen=True)
+class ClientPolicy:
+    """
+    What a client may do, compiled once when the client is loaded so the
+    checks on the request path are set lookups.
+    """
+
+    grant_types: FrozenSet[str]
+    scopes: FrozenSet[str]
+    redirect_uris: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, grant_types: Iterable[str], scopes: Iterable[str], redirect_uris: Iterable[str]):
+        return cls(
+            grant_types=frozenset(grant_types),
+            scopes=frozenset(scopes),
+            redirect_uris=frozenset(redirect_uris),
+        )
+
+    def allows_grant(self, grant_type: str) -> bool:
+        return grant_type in self.grant_types
+
+    def allows_redirect(self, redirect_uri: str) -> bool:
+        # Exact match only, as required by RFC 6749 section 3.1.2
+        return redirect_uri in self.redirect_uris
+
+    def allows_scopes(self, requested: FrozenSet[str]) -> bool:
+        return requested <= self.scopes
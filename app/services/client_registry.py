@@ -0,0 +1,130 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.resilience import DependencyUnavailable
+from app.models.client import OAuthClient
+from app.services.client_policy import ClientPolicy
+
+# Bumped by ClientRegistry.invalidate(); every worker compares it with the
+# version its cached record was loaded at.
+CLIENT_VERSION_KEY = "oauth:client:version:{client_id}"
+
+# Version not readable (Redis down): the cached record is trusted for ttl
+UNKNOWN_VERSION = object()
+
+
+@dataclass(frozen=True)
+class ClientRecord:
+    """Read-only snapshot of an OAuthClient row, safe to share across requests."""
+
+    id: object
+    client_id: str
+    client_secret_hash: Optional[str]
+    redirect_uris: Tuple[str, ...]
+    allowed_grant_types: Tuple[str, ...]
+    allowed_scopes: Tuple[str, ...]
+    is_confidential: bool
+    access_token_format: str
+    policy: ClientPolicy
+
+    @classmethod
+    def from_model(cls, client: OAuthClient) -> "ClientRecord":
+        return cls(
+            id=client.id,
+            client_id=client.client_id,
+            client_secret_hash=client.client_secret_hash,
+            redirect_uris=tuple(client.redirect_uris or ()),
+            allowed_grant_types=tuple(client.allowed_grant_types or ()),
+            allowed_scopes=tuple(client.allowed_scopes or ()),
+            is_confidential=client.is_confidential is not False,
+            access_token_format=client.access_token_format or "jwt",
+            policy=ClientPolicy.compile(
+                grant_types=client.allowed_grant_types or (),
+                scopes=client.allowed_scopes or (),
+                redirect_uris=client.redirect_uris or (),
+            ),
+        )
+
+
+class ClientRegistry:
+    """
+    Process-local cache of OAuth clients. Preloaded before workers fork,
+    so the records are shared copy-on-write. A record is re-read from the
+    database once the client's version in Redis has changed (invalidate(),
+    e.g. on secret rotation), which every worker checks at most once per
+    check_interval seconds per client, and in any case after ttl seconds.
+    """
+
+    def __init__(self, ttl: float, check_interval: float):
+        self.ttl = ttl
+        self.check_interval = check_interval
+        # client_id -> [loaded at, version checked at, version, record]
+        self._clients: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def load_all(self, db):
+        now = time.monotonic()
+        records = [ClientRecord.from_model(c) for c in db.query(OAuthClient).all()]
+        versions = self._versions([r.client_id for r in records])
+        clients = {
+            r.client_id: [now, now, version, r]
+            for r, version in zip(records, versions)
+        }
+        with self._lock:
+            self._clients = clients
+
+    def get(self, db, client_id: str) -> Optional[ClientRecord]:
+        now = time.monotonic()
+        entry = self._clients.get(client_id)
+        fresh = entry is not None and now - entry[0] < self.ttl
+        if fresh and now - entry[1] < self.check_interval:
+            return entry[3]
+
+        (version,) = self._versions([client_id])
+        if fresh and (version is UNKNOWN_VERSION or entry[2] == version):
+            entry[1] = now
+            return entry[3]
+
+        def lookup():
+            return db.query(OAuthClient).filter_by(client_id=client_id).first()
+
+        # A client that was ever invalidated is read from the primary, a
+        # lagging replica could still hand out its old secret
+        changed = version is not None and version is not UNKNOWN_VERSION
+        client = lookup() if changed else db.read(lookup)
+        if not client:
+            return None
+
+        # The version read before the row: a bump in between reloads again
+        record = ClientRecord.from_model(client)
+        now = time.monotonic()
+        with self._lock:
+            self._clients[client_id] = [now, now, version, record]
+        return record
+
+    def invalidate(self, client_id: str):
+        """Reload the client in every worker. Call after changing it."""
+        with self._lock:
+            self._clients.pop(client_id, None)
+        if redis_client:
+            redis_client.incr(CLIENT_VERSION_KEY.format(client_id=client_id))
+
+    def _versions(self, client_ids) -> list:
+        if not redis_client or not client_ids:
+            return [None] * len(client_ids)
+        try:
+            return redis_client.mget(
+                [CLIENT_VERSION_KEY.format(client_id=c) for c in client_ids]
+            )
+        except DependencyUnavailable:
+            return [UNKNOWN_VERSION] * len(client_ids)
+
+
+client_registry = ClientRegistry(
+    ttl=settings.CLIENT_REGISTRY_TTL_SECONDS,
+    check_interval=settings.CLIENT_REGISTRY_CHECK_SECONDS,
+)
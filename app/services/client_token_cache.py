@@ -0,0 +1,85 @@
+import hashlib
+import json
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.resilience import DependencyUnavailable
+
+
+# One Redis hash per client: field = secret fingerprint + normalized scope,
+# value = cached token. Deleting the hash invalidates every cached token
+# of the client at once.
+CACHE_KEY = "oauth:cc_token:{client_id}"
+
+
+def _field(client, scope: str) -> str:
+    # A rotated secret changes the fingerprint, so tokens minted with the
+    # old secret are never served again.
+    fingerprint = hashlib.sha256(
+        (client.client_secret_hash or "").encode()
+    ).hexdigest()[:16]
+    return f"{fingerprint}|{scope}"
+
+
+def get_cached_token(client, scope: str) -> Optional[dict]:
+    if not settings.CLIENT_CREDENTIALS_CACHE_ENABLED or not redis_client:
+        return None
+
+    try:
+        raw = redis_client.hget(
+            CACHE_KEY.format(client_id=client.client_id),
+            _field(client, scope),
+        )
+    except DependencyUnavailable:
+        # The cache is an optimization, mint a fresh token instead
+        return None
+    if not raw:
+        return None
+
+    entry = json.loads(raw)
+    now = int(time.time())
+
+    # Stop handing out a token once the configured fraction of its
+    # lifetime has passed, so callers never receive a nearly expired one.
+    lifetime = entry["exp"] - entry["iat"]
+    reuse_until = entry["iat"] + int(
+        lifetime * settings.CLIENT_CREDENTIALS_CACHE_REUSE_FRACTION
+    )
+    if now >= reuse_until:
+        return None
+
+    return {
+        "access_token": entry["access_token"],
+        "token_type": "Bearer",
+        "expires_in": entry["exp"] - now,
+        "scope": scope,
+    }
+
+
+def store_token(client, scope: str, access_token: str, iat: int, exp: int):
+    if not settings.CLIENT_CREDENTIALS_CACHE_ENABLED or not redis_client:
+        return
+
+    key = CACHE_KEY.format(client_id=client.client_id)
+    pipe = redis_client.pipeline()
+    pipe.hset(
+        key,
+        _field(client, scope),
+        json.dumps({"access_token": access_token, "iat": iat, "exp": exp}),
+    )
+    pipe.expire(key, settings.ACCESS_TOKEN_EXPIRE_SECONDS)
+    try:
+        pipe.execute()
+    except DependencyUnavailable:
+        pass
+
+
+def invalidate_client(client_id: str):
+    """
+    Drop every cached token of a client.
+    Must be called when the client is revoked or its secret is changed.
+    """
+    if redis_client:
+        redis_client.delete(CACHE_KEY.format(client_id=client_id))
@@ -1,17 +1,22 @@
-import secrets
+import time
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from typing import Optional
 
-from app.models.client import OAuthClient
 from app.models.token import AuthorizationCode, RefreshToken
 from app.models.session import UserSession
-from app.core.jwt import create_access_token
+from app.core.access_token import issue_access_token
+from app.core.jwt import create_id_token
 from app.core.config import settings
 from app.utils.password import verify_password
 from app.utils.pkce import verify_pkce
-from app.core.redis import redis_client
+from app.services.session_store import check_session
+from app.services import client_token_cache
+from app.services.client_registry import ClientRecord, client_registry
+from app.services.client_policy import normalize_scope, parse_scope
+from app.services.audit import audit
+from app.services.activity import activity
 
 
 class OAuthService:
@@ -23,32 +28,44 @@ class OAuthService:
     # Authorization Code Flow
     # ------------------------
 
-    def create_authorization_code(self,response_type: str,client_id: str,redirect_uri: str,scope: str,user_id,code_challenge:Optional[str],code_challenge_method: Optional[str]) -> str:
+    def create_authorization_code(self,response_type: str,client_id: str,redirect_uri: str,scope: str,user_id,session_id,code_challenge:Optional[str],code_challenge_method: Optional[str],nonce: Optional[str] = None) -> str:
 
         if response_type != "code":
             raise HTTPException(status_code=400, detail="Invalid response_type")
 
         client = self._get_client(client_id)
+        self._require_grant(client, "authorization_code")
 
-        if redirect_uri not in client.redirect_uris:
+        if not client.policy.allows_redirect(redirect_uri):
             raise HTTPException(status_code=400, detail="Invalid redirect_uri")
 
-        code = secrets.token_urlsafe(32)
+        # Normalized once here, every token issued from the code inherits it
+        scope = self._check_scope(client, scope)
+
+        # On the shard of the session that authorized it, which is not the
+        # user's home shard for sessions from before sharding or from an
+        # earlier shard count; the code names its shard
+        shard_db = self.db.for_session(session_id)
+        code = shard_db.new_token(32)
 
         auth_code = AuthorizationCode(
             code=code,
             client_id=client.id,
             user_id=user_id,
+            session_id=session_id,
             redirect_uri=redirect_uri,
             scope=scope,
             code_challenge=code_challenge,
             code_challenge_method=code_challenge_method,
+            nonce=nonce,
             expires_at=datetime.utcnow() + timedelta(minutes=10),
         )
 
-        self.db.add(auth_code)
+        shard_db.add(auth_code)
         self.db.commit()
 
+        audit.emit("authorization_code.issued", client_id=client.client_id, user_id=str(user_id))
+
         return code
 
 
@@ -62,14 +79,17 @@ class OAuthService:
     ):
         # Authenticate client
         client = self._authenticate_client(client_id, client_secret)
+        self._require_grant(client, "authorization_code")
 
-        # Load auth code
+        # Load auth code. Its shard also holds the authorizing session,
+        # and the refresh token is stored there too.
+        shard_db = self.db.for_token(code)
         auth_code = (
-            self.db.query(AuthorizationCode)
+            shard_db.query(AuthorizationCode)
             .filter(AuthorizationCode.code == code)
             .first()
         )
-        if not auth_code:
+        if not auth_code or auth_code.client_id != client.id:
             raise HTTPException(status_code=400, detail="Invalid authorization code")
 
         # Expiry check
@@ -87,25 +107,33 @@ class OAuthService:
             ):
                 raise HTTPException(status_code=400, detail="PKCE verification failed")
 
-        session = (
-            self.db.query(UserSession)
-            .filter(UserSession.user_id == auth_code.user_id, UserSession.is_active==True)
-            .first()
-        )
+        if auth_code.session_id:
+            session = (
+                shard_db.query(UserSession)
+                .filter(UserSession.id == auth_code.session_id, UserSession.is_active == True)
+                .first()
+            )
+        else:
+            # Codes issued before they recorded their session
+            session = (
+                shard_db.query(UserSession)
+                .filter(UserSession.user_id == auth_code.user_id, UserSession.is_active==True)
+                .first()
+            )
 
         if not session:
             raise HTTPException(status_code=400, detail="Active session not exists")
 
         # Issue access token
-        access_token = create_access_token(
+        access_token = issue_access_token(
+            client,
             subject=str(auth_code.user_id),
             scope=auth_code.scope,
-            client_id=client.client_id,
             session_id=str(session.id),  # or session_id if you store it
         )
 
         # Issue refresh token
-        refresh_token_value = secrets.token_urlsafe(48)
+        refresh_token_value = shard_db.new_token(48)
 
         refresh_token = RefreshToken(
             token=refresh_token_value,
@@ -116,14 +144,22 @@ class OAuthService:
             expires_at=datetime.utcnow() + timedelta(seconds=settings.REFRESH_TOKEN_EXPIRE_SECONDS),
         )
 
-        self.db.add(refresh_token)
+        shard_db.add(refresh_token)
 
         # Invalidate auth code (single-use)
-        self.db.delete(auth_code)
+        shard_db.delete(auth_code)
 
         self.db.commit()
 
-        return {
+        audit.emit(
+            "token.issued",
+            grant_type="authorization_code",
+            client_id=client.client_id,
+            user_id=str(auth_code.user_id),
+            session_id=str(session.id),
+        )
+
+        response = {
             "access_token": access_token,
             "refresh_token": refresh_token_value,
             "token_type": "Bearer",
@@ -131,34 +167,63 @@ class OAuthService:
             "scope": auth_code.scope,
         }
 
+        # OIDC: identity of the user for the client itself
+        if "openid" in parse_scope(auth_code.scope):
+            response["id_token"] = create_id_token(
+                subject=auth_code.user_id,
+                client_id=client.client_id,
+                access_token=access_token,
+                nonce=auth_code.nonce,
+                session_id=session.id,
+                auth_time=session.created_at.timestamp() if session.created_at else None,
+            )
+
+        return response
+
     # ------------------------
     # Refresh Token Flow
     # ------------------------
 
     def refresh_access_token(self, client_id: str, refresh_token: str):
-        token = self.db.query(RefreshToken).filter_by(token=refresh_token, is_revoked=False).first()
-        if not token:
-            raise HTTPException(status_code=400, detail="Invalid refresh token")
+        client = self._get_client(client_id)
+        self._require_grant(client, "refresh_token")
 
-        session_id = token.session_id
+        shard_db = self.db.for_token(refresh_token)
+
+        def lookup():
+            return shard_db.query(RefreshToken).filter_by(token=refresh_token, is_revoked=False).first()
 
-        # Redis active session must exist
-        if redis_client:
-            if not redis_client.get(f"oauth:session:active:{session_id}"):
-                raise HTTPException(status_code=401, detail="Session expired")
+        token = shard_db.read(lookup)
 
-        # Redis revoked session must NOT exist
-        if redis_client.get(f"oauth:session:revoked:{session_id}"):
-            raise HTTPException(status_code=401, detail="Session revoked")
+        # A revoked session's tokens may still look valid on a lagging replica
+        if token and shard_db.pins.is_pinned(token.session_id):
+            shard_db.expunge(token)
+            token = lookup()
 
+        # Refresh tokens are bound to the client they were issued to
+        if not token or token.client_id != client.id:
+            raise HTTPException(status_code=400, detail="Invalid refresh token")
+
+        session_id = token.session_id
+
+        # Redis: session must be active and not revoked
+        check_session(session_id)
+        activity.record(session_id, client.client_id)
 
-        access_token = create_access_token(
+        access_token = issue_access_token(
+            client,
             subject=str(token.user_id),
-            client_id=client_id,
             session_id=session_id,
             scope=token.scope,
         )
 
+        audit.emit(
+            "token.refreshed",
+            client_id=client.client_id,
+            user_id=str(token.user_id),
+            session_id=str(session_id),
+        )
+
         return {
             "access_token": access_token,
             "token_type": "Bearer",
@@ -172,17 +237,36 @@ class OAuthService:
 
     def client_credentials_token(self, client_id: str, client_secret: str, scope: str):
         client = self._authenticate_client(client_id, client_secret)
-
-        access_token = create_access_token(
+        self._require_grant(client, "client_credentials")
+        scope = self._check_scope(client, scope)
+
+        # Reuse a still-fresh token for the same (client, scope set)
+        cached = client_token_cache.get_cached_token(client, scope)
+        if cached:
+            audit.emit("token.reused", grant_type="client_credentials", client_id=client.client_id)
+            return cached
+
+        iat = int(time.time())
+        access_token = issue_access_token(
+            client,
             subject=client.client_id,
-            client_id=client.client_id,
             scope=scope,
         )
 
+        client_token_cache.store_token(
+            client,
+            scope,
+            access_token,
+            iat=iat,
+            exp=iat + settings.ACCESS_TOKEN_EXPIRE_SECONDS,
+        )
+
+        audit.emit("token.issued", grant_type="client_credentials", client_id=client.client_id)
+
         return {
             "access_token": access_token,
             "token_type": "Bearer",
-            "expires_in": 900,
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_SECONDS,
             "scope": scope,
         }
 
@@ -190,13 +274,22 @@ class OAuthService:
     # Helpers
     # ------------------------
 
-    def _get_client(self, client_id: str) -> OAuthClient:
-        client = self.db.query(OAuthClient).filter_by(client_id=client_id).first()
+    def _get_client(self, client_id: str) -> ClientRecord:
+        client = client_registry.get(self.db, client_id)
         if not client:
             raise HTTPException(status_code=400, detail="Invalid client")
         return client
 
-    def _authenticate_client(self, client_id: str, client_secret: str) -> OAuthClient:
+    def _require_grant(self, client: ClientRecord, grant_type: str):
+        if not client.policy.allows_grant(grant_type):
+            raise HTTPException(status_code=400, detail="Unauthorized grant_type")
+
+    def _check_scope(self, client: ClientRecord, scope: Optional[str]) -> str:
+        if not client.policy.allows_scopes(parse_scope(scope)):
+            raise HTTPException(status_code=400, detail="Invalid scope")
+        return normalize_scope(scope)
+
+    def _authenticate_client(self, client_id: str, client_secret: str) -> ClientRecord:
         client = self._get_client(client_id)
 
         if client.is_confidential:
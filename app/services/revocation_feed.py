@@ -0,0 +1,58 @@
+import time
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.sdk.revocation import sid_digest
+
+# Redis stream of revoked sessions, consumed by resource servers that
+# validate tokens locally (see app/sdk). Each entry only matters until the
+# last access token of the session has expired, so older entries are trimmed.
+# Sessions are published as digests: a session id is also a cookie value.
+FEED_KEY = "oauth:revocations"
+
+
+def publish_revocation(session_id):
+    publish_revocations([session_id])
+
+
+def publish_revocations(session_ids):
+    """Append many revoked sessions with one Redis round trip."""
+    if not redis_client or not session_ids:
+        return
+
+    now = int(time.time())
+    # Stream ids are millisecond timestamps, anything before the
+    # cutoff can no longer be referenced by a valid access token
+    cutoff_ms = (now - settings.ACCESS_TOKEN_EXPIRE_SECONDS) * 1000
+    exp = now + settings.ACCESS_TOKEN_EXPIRE_SECONDS
+
+    pipe = redis_client.pipeline(transaction=False)
+    for session_id in session_ids:
+        pipe.xadd(
+            FEED_KEY,
+            {"sid_sha256": sid_digest(session_id), "exp": exp},
+            minid=cutoff_ms,
+            approximate=True,
+        )
+    pipe.execute()
+
+
+def read_revocations(since: str = "0", limit: int = 1000) -> dict:
+    """
+    Entries published after the `since` cursor.
+    A consumer whose cursor was trimmed away simply gets every retained
+    entry, which is complete because trimmed ones have expired.
+    """
+    if not redis_client:
+        return {"cursor": since, "revoked": []}
+
+    start = "-" if since == "0" else f"({since}"
+    entries = redis_client.xrange(FEED_KEY, min=start, max="+", count=limit)
+
+    return {
+        "cursor": entries[-1][0] if entries else since,
+        "revoked": [
+            {"sid_sha256": fields["sid_sha256"], "exp": int(fields["exp"])}
+            for _, fields in entries
+        ],
+    }
@@ -0,0 +1,135 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.session import UserSession
+from app.models.token import RefreshToken
+from app.services.session_store import session_store
+from app.services.revocation_feed import publish_revocations
+from app.services.audit import audit
+
+
+def encode_cursor(created_at: datetime, session_id) -> str:
+    raw = f"{created_at.isoformat()}|{session_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, session_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def revoke_in_store(db: Session, session_ids: Iterable):
+    """
+    Redis side of a revocation: drop the active markers, blacklist access
+    tokens, notify resource servers and keep reads of these sessions on
+    the primary until replicas catch up. Each step is one pipelined round
+    trip for the whole chunk.
+    """
+    session_ids = list(session_ids)
+    if session_store:
+        session_store.revoke_many(session_ids)
+        publish_revocations(session_ids)
+
+    db.pin_many(session_ids)
+
+
+class SessionService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # =========================
+    # Listing ("your devices")
+    # =========================
+    def list_sessions(self, user_id, limit: int, cursor: Optional[str] = None) -> dict:
+        """
+        One page of active sessions, newest first. Keyset pagination on
+        (created_at, id): every page is a range scan of
+        ix_user_sessions_user_active, however deep the page. With several
+        shards each one returns its first page and the pages are merged.
+        """
+        query = (
+            select(UserSession.id, UserSession.created_at, UserSession.expires_at)
+            .where(
+                UserSession.user_id == user_id,
+                UserSession.is_active == True,
+                UserSession.expires_at > datetime.utcnow(),
+            )
+            .order_by(UserSession.created_at.desc(), UserSession.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, session_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(UserSession.created_at, UserSession.id) < (created_at, session_id)
+            )
+
+        rows = []
+        for shard in range(self.db.shards.count):
+            shard_db = self.db.for_shard(shard)
+            rows += shard_db.read(
+                lambda: shard_db.execute(query).all(),
+                pin_key=f"user:{user_id}",
+            )
+        if self.db.shards.count > 1:
+            rows.sort(key=lambda row: (row.created_at, row.id), reverse=True)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return {
+            "sessions": [
+                {
+                    "id": str(row.id),
+                    "created_at": row.created_at,
+                    "expires_at": row.expires_at,
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+
+    # =========================
+    # Single-device logout
+    # =========================
+    def revoke_session(self, user_id, session_id):
+        shard_db = self.db.for_session(session_id)
+        session = (
+            shard_db.query(UserSession.id)
+            .filter_by(id=session_id, user_id=user_id, is_active=True)
+            .first()
+        )
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        # Redis first: if the database write then fails the session is
+        # already unusable, never the other way round
+        revoke_in_store(self.db, [session.id])
+
+        (
+            shard_db.query(UserSession)
+            .filter(UserSession.id == session.id)
+            .update({"is_active": False, "expires_at": datetime.utcnow()})
+        )
+        (
+            shard_db.query(RefreshToken)
+            .filter(RefreshToken.session_id == session.id)
+            .update({"is_revoked": True})
+        )
+        self.db.commit()
+
+        # The owner's device list must not show it from a lagging replica
+        self.db.pin(f"user:{user_id}")
+
+        audit.emit("session.revoked", user_id=str(user_id), session_id=str(session.id))
@@ -0,0 +1,197 @@
+import struct
+import time
+import uuid
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.redis import redis_binary_client, redis_client
+
+ACTIVE = "active"
+REVOKED = "revoked"
+
+
+def _revoked_ttl() -> int:
+    # Once every access token of the session has expired the marker is useless
+    return settings.ACCESS_TOKEN_EXPIRE_SECONDS
+
+
+class _SessionStore:
+
+    def revoke(self, session_id):
+        self.revoke_many([session_id])
+
+
+class LegacySessionStore(_SessionStore):
+    """
+    One string key per state:
+        oauth:session:active:{uuid}  -> user id   (TTL = session lifetime)
+        oauth:session:revoked:{uuid} -> "1"       (TTL = access token lifetime)
+    """
+
+    ACTIVE_KEY = "oauth:session:active:{sid}"
+    REVOKED_KEY = "oauth:session:revoked:{sid}"
+
+    def __init__(self, client):
+        self.redis = client
+
+    def activate(self, session_id, user_id, ttl: int):
+        self.redis.setex(self.ACTIVE_KEY.format(sid=session_id), ttl, str(user_id))
+
+    def revoke_many(self, session_ids: Iterable):
+        pipe = self.redis.pipeline(transaction=False)
+        for sid in session_ids:
+            pipe.delete(self.ACTIVE_KEY.format(sid=sid))
+            pipe.setex(self.REVOKED_KEY.format(sid=sid), _revoked_ttl(), "1")
+        pipe.execute()
+
+    def forget_many(self, session_ids: Iterable):
+        """Drop both keys, e.g. once the state lives in another store."""
+        keys = [
+            key.format(sid=sid)
+            for sid in session_ids
+            for key in (self.ACTIVE_KEY, self.REVOKED_KEY)
+        ]
+        if keys:
+            self.redis.delete(*keys)
+
+    def status(self, session_id) -> Optional[str]:
+        active, revoked = self.redis.mget(
+            self.ACTIVE_KEY.format(sid=session_id),
+            self.REVOKED_KEY.format(sid=session_id),
+        )
+        if revoked:
+            return REVOKED
+        if active:
+            return ACTIVE
+        return None
+
+
+class CompactSessionStore(_SessionStore):
+    """
+    Sessions grouped into bucketed hashes so small buckets stay listpack
+    encoded:
+        key   = "oauth:sb:" + bucket (top bucket_bits of the UUID, 2-3 bytes)
+        field = 16-byte binary UUID
+        value = 1 status byte (A/R) + 4-byte big-endian expiry
+
+    Expiry lives in the value because plain hash fields can't expire; stale
+    fields are ignored on read and removed by sweep(), or by Redis itself
+    when field_ttl (HEXPIRE, Redis >= 7.4) is enabled.
+    """
+
+    PREFIX = b"oauth:sb:"
+    VALUE = struct.Struct(">cI")
+
+    def __init__(self, client, bucket_bits: int, field_ttl: bool = False, fallback=None):
+        self.redis = client
+        self.bucket_bits = bucket_bits
+        self.bucket_bytes = (bucket_bits + 7) // 8
+        self.field_ttl = field_ttl
+        self.fallback = fallback
+
+    def _location(self, session_id):
+        raw = uuid.UUID(str(session_id)).bytes
+        bucket = int.from_bytes(raw[:4], "big") >> (32 - self.bucket_bits)
+        return self.PREFIX + bucket.to_bytes(self.bucket_bytes, "big"), raw
+
+    def _set(self, pipe, session_id, status: bytes, ttl: int, only_new: bool = False):
+        key, field = self._location(session_id)
+        value = self.VALUE.pack(status, int(time.time()) + ttl)
+        if only_new:
+            pipe.hsetnx(key, field, value)
+        else:
+            pipe.hset(key, field, value)
+        if self.field_ttl:
+            pipe.hexpire(key, ttl, field)
+
+    def activate(self, session_id, user_id, ttl: int):
+        pipe = self.redis.pipeline(transaction=False)
+        self._set(pipe, session_id, b"A", ttl)
+        pipe.execute()
+
+    def revoke_many(self, session_ids: Iterable):
+        session_ids = list(session_ids)
+        pipe = self.redis.pipeline(transaction=False)
+        for sid in session_ids:
+            self._set(pipe, sid, b"R", _revoked_ttl())
+        pipe.execute()
+
+        # The legacy active key outlives the revoked field: once that is
+        # swept, status() would fall back to it and migrate re-import it
+        if self.fallback:
+            self.fallback.forget_many(session_ids)
+
+    def status(self, session_id) -> Optional[str]:
+        try:
+            key, field = self._location(session_id)
+        except ValueError:
+            return None
+
+        value = self.redis.hget(key, field)
+        if value is None:
+            if self.fallback:
+                return self.fallback.status(session_id)
+            return None
+
+        flag, expires = self.VALUE.unpack(value)
+        if expires <= time.time():
+            return None
+        return REVOKED if flag == b"R" else ACTIVE
+
+    # ------------------------
+    # Maintenance
+    # ------------------------
+
+    def import_entry(self, pipe, session_id, status: str, ttl: int):
+        """Migration: never overwrite state written by the new code path."""
+        self._set(pipe, session_id, b"R" if status == REVOKED else b"A", ttl, only_new=True)
+
+    def sweep(self, batch: int = 1000) -> int:
+        """Delete expired fields. Returns how many were removed."""
+        now = time.time()
+        removed = 0
+        for key in self.redis.scan_iter(match=self.PREFIX + b"*", count=batch):
+            expired = [
+                field
+                for field, value in self.redis.hgetall(key).items()
+                if self.VALUE.unpack(value)[1] <= now
+            ]
+            if expired:
+                removed += self.redis.hdel(key, *expired)
+        return removed
+
+
+def build_session_store():
+    if not redis_client:
+        return None
+
+    legacy = LegacySessionStore(redis_client)
+    if settings.SESSION_STORE != "compact":
+        return legacy
+
+    return CompactSessionStore(
+        redis_binary_client,
+        bucket_bits=settings.SESSION_STORE_BUCKET_BITS,
+        field_ttl=settings.SESSION_STORE_FIELD_TTL,
+        fallback=legacy if settings.SESSION_STORE_LEGACY_FALLBACK else None,
+    )
+
+
+session_store = build_session_store()
+
+
+def check_session(session_id):
+    """
+    Raise 401 unless the session is active and not revoked.
+    Fails closed: if Redis is down, DependencyUnavailable turns into 503.
+    """
+    if not session_store:
+        return
+
+    state = session_store.status(session_id)
+    if state == REVOKED:
+        raise HTTPException(status_code=401, detail="Session revoked")
+    if state != ACTIVE:
+        raise HTTPException(status_code=401, detail="Session expired")
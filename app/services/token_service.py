@@ -1,10 +1,52 @@
+import uuid
+from datetime import datetime
+
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.jwt import decode_token
-from app.core.redis import redis_client
+from app.core.access_token import (
+    decode_access_token,
+    is_reference_token,
+    revoke_reference_token,
+)
+from app.services.session_store import REVOKED, session_store
+from app.core.resilience import DependencyUnavailable
+from app.models.session import UserSession
 from app.models.token import RefreshToken
-from app.core.config import settings
+from app.services.session_service import revoke_in_store
+from app.services.audit import audit
+
+
+def introspect(token: str) -> dict:
+    """
+    RFC 7662 response for an access token. Needs no database session, so
+    the ASGI fast path (app.api.fastpath) calls it directly.
+    """
+    try:
+        payload = decode_access_token(token)
+    except Exception:
+        return {"active": False}
+
+    # Session revoked? Unknown revocation state counts as inactive.
+    # Client credentials tokens have no session.
+    session_id = payload.get("sid")
+    if session_id and session_store:
+        try:
+            if session_store.status(session_id) == REVOKED:
+                return {"active": False}
+        except DependencyUnavailable:
+            return {"active": False}
+
+    return {
+        "active": True,
+        "sub": payload.get("sub"),
+        "scope": payload.get("scope"),
+        "client_id": payload.get("aud"),
+        "iss": payload.get("iss"),
+        "iat": payload.get("iat"),
+        "exp": payload.get("exp"),
+    }
 
 
 class TokenService:
@@ -15,29 +57,7 @@ class TokenService:
     # Token Introspection
     # =========================
     def introspect_token(self, token: str) -> dict:
-        try:
-            payload = decode_token(token)
-        except Exception:
-            return {"active": False}
-
-        session_id = payload.get("sid")
-        if not session_id:
-            return {"active": False}
-
-        # Session revoked?
-        if redis_client:
-            if redis_client.get(f"oauth:session:revoked:{session_id}"):
-                return {"active": False}
-
-        return {
-            "active": True,
-            "sub": payload.get("sub"),
-            "scope": payload.get("scope"),
-            "client_id": payload.get("aud"),
-            "iss": payload.get("iss"),
-            "iat": payload.get("iat"),
-            "exp": payload.get("exp"),
-        }
+        return introspect(token)
 
     # =========================
     # Token Revocation (OAuth)
@@ -46,29 +66,37 @@ class TokenService:
         """
         OAuth token revocation:
         - revoke refresh token
-        - revoke session (thus invalidating access tokens)
+        - revoke reference access token (delete its Redis entry)
+        - revoke session of a JWT (thus invalidating access tokens)
         """
-        try:
-            payload = decode_token(token)
-        except Exception:
-            # Per RFC 7009: revocation is idempotent
-            return
+        if is_reference_token(token):
+            # Opaque token or refresh token; deleting is a no-op for the latter
+            revoke_reference_token(token)
+            audit.emit("token.revoked", token_type="reference")
+        else:
+            try:
+                payload = decode_token(token)
+            except Exception:
+                # Per RFC 7009: revocation is idempotent
+                return
 
-        session_id = payload.get("sid")
+            session_id = payload.get("sid")
 
-        # Revoke session (kills all access tokens)
-        if session_id and redis_client:
-            redis_client.setex(
-                f"oauth:session:revoked:{session_id}",
-                settings.ACCESS_TOKEN_EXPIRE_SECONDS,
-                "1",
-            )
+            # Revoke session (kills all access tokens and the SSO cookie)
+            if session_id:
+                self._revoke_session(session_id)
 
-            redis_client.delete(f"oauth:session:active:{session_id}")
+            audit.emit(
+                "token.revoked",
+                token_type="access_token",
+                client_id=payload.get("aud"),
+                session_id=session_id,
+            )
 
         # Revoke refresh token if exists
+        shard_db = self.db.for_token(token)
         rt = (
-            self.db.query(RefreshToken)
+            shard_db.query(RefreshToken)
             .filter(
                 RefreshToken.token == token,
                 RefreshToken.is_revoked == False,
@@ -79,3 +107,27 @@ class TokenService:
         if rt:
             rt.is_revoked = True
             self.db.commit()
+            self.db.pin(rt.session_id)
+
+            audit.emit(
+                "token.revoked",
+                token_type="refresh_token",
+                user_id=str(rt.user_id),
+                session_id=str(rt.session_id),
+            )
+
+    def _revoke_session(self, session_id):
+        # Redis first, as in SessionService.revoke_session
+        revoke_in_store(self.db, [session_id])
+
+        try:
+            sid = uuid.UUID(str(session_id))
+        except ValueError:
+            return
+        shard_db = self.db.for_session(sid)
+        (
+            shard_db.query(UserSession)
+            .filter(UserSession.id == sid, UserSession.is_active == True)
+            .update({"is_active": False, "expires_at": datetime.utcnow()})
+        )
+        self.db.commit()
@@ -1,6 +1,43 @@
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+
+def build_context(
+    scheme: str = "bcrypt",
+    bcrypt_rounds: int = 12,
+    argon2_time_cost: int = 3,
+    argon2_memory_cost: int = 65536,
+    argon2_parallelism: int = 4,
+) -> CryptContext:
+    """
+    New hashes use `scheme` with the given cost. Hashes of the other scheme,
+    or of the same scheme with a lower cost, still verify but are reported
+    by needs_update() so they can be replaced on the next login.
+    """
+    return CryptContext(
+        schemes=[scheme] + [s for s in ("bcrypt", "argon2") if s != scheme],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_context(
+    settings.PASSWORD_SCHEME,
+    bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost=settings.PASSWORD_ARGON2_MEMORY_KIB,
+    argon2_parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+)
 
 
 def hash_password(password: str) -> str:
@@ -8,4 +45,12 @@ def hash_password(password: str) -> str:
 
 
 def verify_password(password: str, hash: str) -> bool:
-    return pwd_context.verify(password, hash)
\ No newline at end of file
+    return pwd_context.verify(password, hash)
+
+
+def verify_and_rehash(password: str, hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify, and return a replacement hash when the stored one no longer
+    matches the configured policy (None otherwise).
+    """
+    return pwd_context.verify_and_update(password, hash)
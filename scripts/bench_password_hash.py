@@ -0,0 +1,82 @@
+# scripts/bench_password_hash.py
+#
+# Verify latency and peak memory per hashing scheme. Memory is the growth
+# of the RSS high-water mark (VmHWM, Linux) across one verify in a fresh
+# interpreter: argon2 allocates outside the Python heap, and ru_maxrss
+# would carry over the parent's peak.
+#
+#   python -m scripts.bench_password_hash [verifies]
+
+import statistics
+import subprocess
+import sys
+import time
+
+from app.core.config import settings
+from app.utils.password import build_context
+
+verifies = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+SCHEMES = {
+    "configured": dict(
+        scheme=settings.PASSWORD_SCHEME,
+        bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+        argon2_time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+        argon2_memory_cost=settings.PASSWORD_ARGON2_MEMORY_KIB,
+        argon2_parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+    ),
+    "bcrypt-10": dict(scheme="bcrypt", bcrypt_rounds=10),
+    "bcrypt-12": dict(scheme="bcrypt", bcrypt_rounds=12),
+    "bcrypt-14": dict(scheme="bcrypt", bcrypt_rounds=14),
+    "argon2id-19M-t2": dict(scheme="argon2", argon2_time_cost=2, argon2_memory_cost=19456, argon2_parallelism=1),
+    "argon2id-64M-t3": dict(scheme="argon2", argon2_time_cost=3, argon2_memory_cost=65536, argon2_parallelism=4),
+}
+
+# Child process: peak RSS growth caused by a single verify
+MEMORY = """
+import sys
+from app.utils.password import build_context
+
+def hwm_kib():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+
+context = build_context(**{params})
+before = hwm_kib()
+context.verify("benchmark-password", sys.argv[1])
+print(hwm_kib() - before)
+"""
+
+
+def latency(context, hashed):
+    timings = []
+    for _ in range(verifies):
+        started = time.perf_counter()
+        context.verify("benchmark-password", hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+
+def peak_kib(params, hashed):
+    out = subprocess.run(
+        [sys.executable, "-c", MEMORY.format(params=params), hashed],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return int(out.stdout.strip().splitlines()[-1])
+
+
+print(f"{'scheme':<18} {'p50 ms':>9} {'p95 ms':>9} {'peak KiB':>10}")
+for name, params in SCHEMES.items():
+    context = build_context(**params)
+    try:
+        hashed = context.hash("benchmark-password")
+    except Exception as exc:
+        # e.g. argon2-cffi not installed
+        print(f"{name:<18} skipped: {exc}")
+        continue
+
+    p50, p95 = latency(context, hashed)
+    print(f"{name:<18} {p50:9.1f} {p95:9.1f} {peak_kib(params, hashed):10d}")
@@ -0,0 +1,76 @@
+# scripts/bench_session_memory.py
+#
+# Redis memory per session for the legacy and compact encodings.
+# Uses a scratch database which is FLUSHED between runs:
+#
+#   python -m scripts.bench_session_memory --url redis://localhost:6379/15 --sessions 1000000
+
+import argparse
+import time
+import uuid
+
+import redis
+
+from app.services.session_store import CompactSessionStore, LegacySessionStore
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--url", required=True, help="scratch Redis database, will be flushed")
+parser.add_argument("--sessions", type=int, default=1_000_000)
+parser.add_argument("--revoked-percent", type=int, default=5)
+parser.add_argument("--bucket-bits", type=int, default=None)
+parser.add_argument("--batch", type=int, default=10_000)
+args = parser.parse_args()
+
+client = redis.Redis.from_url(args.url)
+text_client = redis.Redis.from_url(args.url, decode_responses=True)
+
+# Aim for ~64 sessions per bucket, comfortably under hash-max-listpack-entries
+bucket_bits = args.bucket_bits or max(1, (args.sessions // 64).bit_length())
+
+SESSION_TTL = 7 * 24 * 3600
+USER_ID = str(uuid.uuid4())
+
+
+def used_memory():
+    return client.info("memory")["used_memory"]
+
+
+def fill(store):
+    written = 0
+    revoke_every = 100 // args.revoked_percent if args.revoked_percent else 0
+
+    while written < args.sessions:
+        n = min(args.batch, args.sessions - written)
+        batch = [uuid.uuid4() for _ in range(n)]
+        pipe = store.redis.pipeline(transaction=False)
+        for i, sid in enumerate(batch):
+            if isinstance(store, CompactSessionStore):
+                store._set(pipe, sid, b"A", SESSION_TTL)
+            else:
+                pipe.setex(store.ACTIVE_KEY.format(sid=sid), SESSION_TTL, USER_ID)
+        pipe.execute()
+
+        if revoke_every:
+            store.revoke_many(batch[::revoke_every])
+        written += n
+
+
+def measure(label, store):
+    client.flushdb()
+    before = used_memory()
+    started = time.perf_counter()
+    fill(store)
+    elapsed = time.perf_counter() - started
+    after = used_memory()
+
+    print(
+        f"{label:<10} {(after - before) / args.sessions:8.1f} bytes/session "
+        f"{(after - before) / 2**20:10.1f} MiB total "
+        f"{args.sessions / elapsed:10.0f} writes/s"
+    )
+    client.flushdb()
+
+
+print(f"{args.sessions} sessions, {args.revoked_percent}% revoked, {bucket_bits} bucket bits")
+measure("legacy", LegacySessionStore(text_client))
+measure("compact", CompactSessionStore(client, bucket_bits=bucket_bits))
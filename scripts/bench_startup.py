@@ -0,0 +1,64 @@
+# scripts/bench_startup.py
+#
+# Import and startup time of the application, measured in fresh
+# interpreters so module caches don't hide the cost.
+#
+#   python -m scripts.bench_startup [runs]
+
+import statistics
+import subprocess
+import sys
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+IMPORT = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+STARTUP = """
+import time
+t = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import create_app
+with TestClient(create_app()) as client:
+    client.get("/health")
+print(time.perf_counter() - t)
+"""
+
+
+def measure(code):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+for label, code in [("import app.main", IMPORT), ("create_app + lifespan", STARTUP)]:
+    samples = measure(code)
+    print(
+        f"{label:<24} median {statistics.median(samples) * 1000:8.1f} ms"
+        f"  min {min(samples) * 1000:8.1f} ms"
+    )
+
+# Slowest imports, from the interpreter's own accounting
+out = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", "import app.main"],
+    check=True,
+    capture_output=True,
+    text=True,
+)
+rows = []
+for line in out.stderr.splitlines():
+    # "import time: <self us> | <cumulative us> | <module>"
+    if not line.startswith("import time:") or "cumulative" in line:
+        continue
+    _, cumulative_us, name = line.split("|")
+    rows.append((int(cumulative_us), name.rstrip()))
+
+print("\nslowest imports (cumulative):")
+for cumulative_us, name in sorted(rows, reverse=True)[:15]:
+    print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
@@ -0,0 +1,54 @@
+# scripts/bench_token_formats.py
+#
+# Issuance and validation cost of JWT vs reference access tokens.
+# Reference tokens need REDIS_URL; the Redis round trip is part of the cost.
+#
+#   python -m scripts.bench_token_formats [iterations]
+
+import sys
+import time
+
+from app.core.access_token import (
+    TOKEN_FORMAT_JWT,
+    TOKEN_FORMAT_REFERENCE,
+    decode_access_token,
+    issue_access_token,
+)
+from app.core.redis import redis_client
+from app.models.client import OAuthClient
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+
+def bench(label, fn):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<24} {elapsed / iterations * 1e6:>9.1f} us/op "
+        f"{iterations / elapsed:>10.0f} ops/s"
+    )
+
+
+formats = [TOKEN_FORMAT_JWT]
+if redis_client:
+    formats.append(TOKEN_FORMAT_REFERENCE)
+else:
+    print("REDIS_URL not set, skipping reference tokens")
+
+for token_format in formats:
+    client = OAuthClient(client_id="bench_client", access_token_format=token_format)
+
+    def issue():
+        return issue_access_token(
+            client,
+            subject="00000000-0000-0000-0000-000000000000",
+            scope="read write",
+            session_id="00000000-0000-0000-0000-000000000001",
+        )
+
+    token = issue()
+    print(f"\n[{token_format}] token size: {len(token)} bytes")
+    bench(f"{token_format} issue", issue)
+    bench(f"{token_format} validate", lambda: decode_access_token(token))
@@ -0,0 +1,319 @@
+# scripts/bulk_provision.py
+#
+# Streaming bulk import/export of users and OAuth clients through
+# Postgres COPY. Input is read one batch at a time, so memory stays
+# constant regardless of file size.
+#
+#   python -m scripts.bulk_provision import users users.csv
+#   python -m scripts.bulk_provision import clients clients.jsonl --workers 8
+#   python -m scripts.bulk_provision export users users.csv
+#
+# users:   email, password_hash | password, [id, is_active, created_at]
+# clients: client_id, client_secret | client_secret_hash, redirect_uris,
+#          allowed_grant_types, allowed_scopes,
+#          [id, is_confidential, access_token_format]
+#
+# Existing password hashes are imported as-is. Plaintext passwords and
+# client secrets are hashed in parallel worker processes. List columns are
+# space-separated in CSV and JSON arrays in JSONL.
+#
+# Imports are resumable: after each committed batch the number of input
+# rows consumed is written to <file>.checkpoint, and a rerun skips them.
+# Rows that already exist (same id / email / client_id) are left untouched.
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from app.db.session import engine
+from app.utils.password import hash_password, pwd_context
+
+
+def _bool(value, default=True):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "t", "yes", "y")
+
+
+def _list(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return str(value).split()
+
+
+def _pg_array(values):
+    escaped = ('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return "{" + ",".join(escaped) + "}"
+
+
+# ------------------------
+# Tables
+# ------------------------
+
+class UsersTable:
+    name = "users"
+    columns = ("id", "email", "password_hash", "is_active", "created_at")
+    conflict = "ON CONFLICT DO NOTHING"
+    insert_select = (
+        "SELECT id, email, password_hash, COALESCE(is_active, true), "
+        "COALESCE(created_at, now()) FROM {stage}"
+    )
+    export_select = "id, email, password_hash, is_active, created_at"
+    secret_field = "password"
+    hash_field = "password_hash"
+
+    @staticmethod
+    def to_row(record, secret_hash):
+        # The staging table copies the NOT NULL constraints, so an empty
+        # value would fail the whole COPY instead of this one record
+        email = (record.get("email") or "").strip()
+        if not email:
+            raise ValueError("user record has no email")
+        if not secret_hash:
+            raise ValueError(f"user {email!r} has no password or password_hash")
+        return [
+            record.get("id") or str(uuid.uuid4()),
+            # As given: logins match the stored email exactly
+            email,
+            secret_hash,
+            _bool(record.get("is_active")),
+            record.get("created_at") or None,
+        ]
+
+
+class ClientsTable:
+    name = "oauth_clients"
+    columns = (
+        "id", "client_id", "client_secret_hash", "redirect_uris",
+        "allowed_grant_types", "allowed_scopes", "is_confidential",
+        "access_token_format",
+    )
+    conflict = "ON CONFLICT DO NOTHING"
+    insert_select = (
+        "SELECT id, client_id, client_secret_hash, redirect_uris, "
+        "allowed_grant_types, allowed_scopes, COALESCE(is_confidential, true), "
+        "access_token_format FROM {stage}"
+    )
+    # Arrays leave as space-separated text so a CSV export imports back as-is
+    export_select = (
+        "id, client_id, client_secret_hash, "
+        "array_to_string(redirect_uris, ' ') AS redirect_uris, "
+        "array_to_string(allowed_grant_types, ' ') AS allowed_grant_types, "
+        "array_to_string(allowed_scopes, ' ') AS allowed_scopes, "
+        "is_confidential, access_token_format"
+    )
+    secret_field = "client_secret"
+    hash_field = "client_secret_hash"
+
+    @staticmethod
+    def to_row(record, secret_hash):
+        if not record.get("client_id"):
+            raise ValueError("client record has no client_id")
+        return [
+            record.get("id") or str(uuid.uuid4()),
+            record["client_id"],
+            secret_hash,
+            _pg_array(_list(record.get("redirect_uris"))),
+            _pg_array(_list(record.get("allowed_grant_types"))),
+            _pg_array(_list(record.get("allowed_scopes"))),
+            _bool(record.get("is_confidential")),
+            record.get("access_token_format") or "jwt",
+        ]
+
+
+TABLES = {"users": UsersTable, "clients": ClientsTable}
+
+
+# ------------------------
+# Import
+# ------------------------
+
+def read_records(path, fmt):
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)["rows"]
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, rows):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"rows": rows}, f)
+    os.replace(tmp, path)
+
+
+def hash_secrets(pool, table, records):
+    """Existing hashes pass through; plaintext secrets are hashed in parallel."""
+    hashes = [None] * len(records)
+    to_hash = []
+
+    for i, record in enumerate(records):
+        existing = record.get(table.hash_field)
+        if existing:
+            if not pwd_context.identify(existing):
+                raise ValueError(f"unrecognized hash format for record {i}")
+            hashes[i] = existing
+        elif record.get(table.secret_field):
+            to_hash.append(i)
+
+    if to_hash:
+        chunksize = max(1, len(to_hash) // (pool._max_workers * 4))
+        secrets = [records[i][table.secret_field] for i in to_hash]
+        for i, value in zip(to_hash, pool.map(hash_password, secrets, chunksize=chunksize)):
+            hashes[i] = value
+
+    return hashes
+
+
+def copy_batch(conn, table, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if v is None else v for v in row])
+    buffer.seek(0)
+
+    stage = f"stage_{table.name}"
+    columns = ", ".join(table.columns)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+            f"(LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        cursor.copy_expert(f"COPY {stage} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            f"INSERT INTO {table.name} ({columns}) "
+            f"{table.insert_select.format(stage=stage)} {table.conflict}"
+        )
+        inserted = cursor.rowcount
+    conn.commit()
+    return inserted
+
+
+def import_file(args):
+    table = TABLES[args.table]
+    checkpoint = args.checkpoint or args.file + ".checkpoint"
+    skip = 0 if args.restart else read_checkpoint(checkpoint)
+    if skip:
+        print(f"resuming after {skip} rows", file=sys.stderr)
+
+    consumed = skip
+    inserted = 0
+    started = time.perf_counter()
+    conn = engine.raw_connection()
+
+    def flush(batch):
+        nonlocal consumed, inserted
+        hashes = hash_secrets(pool, table, batch)
+        inserted += copy_batch(conn, table, [table.to_row(r, h) for r, h in zip(batch, hashes)])
+        consumed += len(batch)
+        write_checkpoint(checkpoint, consumed)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"{consumed} rows read, {inserted} inserted, "
+            f"{(consumed - skip) / elapsed:,.0f} rows/s",
+            file=sys.stderr,
+        )
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            batch = []
+            for n, record in enumerate(read_records(args.file, args.format)):
+                if n < skip:
+                    continue
+                batch.append(record)
+                if len(batch) >= args.batch:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"done: {consumed - skip} rows in {elapsed:.1f}s "
+        f"({(consumed - skip) / max(elapsed, 1e-9):,.0f} rows/s), {inserted} inserted"
+    )
+
+
+# ------------------------
+# Export
+# ------------------------
+
+def export_file(args):
+    table = TABLES[args.table]
+    started = time.perf_counter()
+    conn = engine.raw_connection()
+
+    try:
+        with open(args.file, "w", newline="", encoding="utf-8") as out:
+            if args.format == "csv":
+                # Server streams straight into the file
+                with conn.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY (SELECT {table.export_select} FROM {table.name}) "
+                        "TO STDOUT WITH (FORMAT csv, HEADER)",
+                        out,
+                    )
+                    rows = cursor.rowcount
+            else:
+                # Named (server-side) cursor: rows arrive in batches
+                with conn.cursor(name="bulk_export") as cursor:
+                    cursor.itersize = args.batch
+                    cursor.execute(f"SELECT {table.export_select} FROM {table.name}")
+                    rows = 0
+                    for row in cursor:
+                        out.write(json.dumps(dict(zip(table.columns, row)), default=str) + "\n")
+                        rows += 1
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"exported {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export users and OAuth clients")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("table", choices=sorted(TABLES))
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", help="default: <file>.checkpoint")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    if not args.format:
+        args.format = "jsonl" if args.file.endswith((".jsonl", ".ndjson")) else "csv"
+
+    if args.command == "import":
+        import_file(args)
+    else:
+        export_file(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# scripts/calibrate_password_hash.py
+#
+# Pick password hashing cost parameters that hit a target verify latency
+# on this machine. Run it on production hardware and copy the printed
+# settings into the environment.
+#
+#   python -m scripts.calibrate_password_hash --scheme bcrypt --target-ms 250
+#   python -m scripts.calibrate_password_hash --scheme argon2 --target-ms 250 --memory-kib 65536
+
+import argparse
+import statistics
+import time
+
+from app.utils.password import build_context
+
+
+def verify_ms(context, samples: int) -> float:
+    hashed = context.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(make_context, costs, target_ms: float, samples: int):
+    """Increase the cost until verify reaches the target; keep the closest."""
+    best = None
+    for cost in costs:
+        ms = verify_ms(make_context(cost), samples)
+        print(f"  cost {cost:>3}: {ms:8.1f} ms")
+        if best is None or abs(ms - target_ms) < abs(best[1] - target_ms):
+            best = (cost, ms)
+        if ms >= target_ms:
+            break
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate password hashing cost")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--memory-kib", type=int, default=65536, help="argon2 memory cost (fixed)")
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2 lanes (fixed)")
+    args = parser.parse_args(argv)
+
+    print(f"calibrating {args.scheme} for {args.target_ms:.0f} ms per verify")
+
+    if args.scheme == "bcrypt":
+        # Each extra round doubles the work
+        rounds, ms = calibrate(
+            lambda cost: build_context("bcrypt", bcrypt_rounds=cost),
+            range(8, 20),
+            args.target_ms,
+            args.samples,
+        )
+        print(f"\nPASSWORD_SCHEME=bcrypt\nPASSWORD_BCRYPT_ROUNDS={rounds}    # {ms:.1f} ms")
+    else:
+        # Memory cost is the security budget and stays fixed; time cost
+        # (passes over memory) is tuned to the latency target
+        time_cost, ms = calibrate(
+            lambda cost: build_context(
+                "argon2",
+                argon2_time_cost=cost,
+                argon2_memory_cost=args.memory_kib,
+                argon2_parallelism=args.parallelism,
+            ),
+            range(1, 21),
+            args.target_ms,
+            args.samples,
+        )
+        print(
+            f"\nPASSWORD_SCHEME=argon2"
+            f"\nPASSWORD_ARGON2_TIME_COST={time_cost}    # {ms:.1f} ms"
+            f"\nPASSWORD_ARGON2_MEMORY_KIB={args.memory_kib}"
+            f"\nPASSWORD_ARGON2_PARALLELISM={args.parallelism}"
+        )
+
+
+if __name__ == "__main__":
+    main()
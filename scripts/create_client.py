@@ -13,7 +13,7 @@ client = OAuthClient(
     client_id="example_client",
     client_secret_hash=hash_password(client_secret),
     redirect_uris=["https://app.example.com/callback"],
-    allowed_grant_types=["authorization_code", "refresh_token"],
+    allowed_grant_types=["authorization_code", "refresh_token", "client_credentials"],
     allowed_scopes=["read", "write", "admin"],
 )
 
@@ -0,0 +1,103 @@
+# scripts/migrate_sessions.py
+#
+# Move session state from the legacy per-session string keys to the
+# compact bucketed hashes, and maintain the compact store.
+#
+# Migration path:
+#   1. deploy with SESSION_STORE=compact SESSION_STORE_LEGACY_FALLBACK=true
+#      (new writes are compact, reads fall back to legacy keys)
+#   2. python -m scripts.migrate_sessions migrate
+#   3. deploy with SESSION_STORE_LEGACY_FALLBACK=false
+#   4. python -m scripts.migrate_sessions delete-legacy
+#
+# Step 4 only deletes: after step 3 revocations no longer remove the legacy
+# keys, so importing them again could revive a session whose revoked field
+# has since expired.
+#
+# Without HEXPIRE (SESSION_STORE_FIELD_TTL=false) run `sweep` periodically
+# to drop expired fields.
+
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.redis import redis_binary_client, redis_client
+from app.services.session_store import (
+    ACTIVE,
+    REVOKED,
+    CompactSessionStore,
+    LegacySessionStore,
+)
+
+
+def _scan(pattern, batch):
+    """Legacy keys matching pattern, batch at a time."""
+    prefix = pattern.split("{")[0]
+    keys = []
+    for key in redis_client.scan_iter(match=prefix + "*", count=batch):
+        keys.append(key)
+        if len(keys) >= batch:
+            yield prefix, keys
+            keys = []
+    if keys:
+        yield prefix, keys
+
+
+def migrate(compact, pattern, status, batch):
+    migrated = 0
+    for prefix, keys in _scan(pattern, batch):
+        ttls = redis_client.pipeline(transaction=False)
+        for key in keys:
+            ttls.ttl(key)
+
+        pipe = redis_binary_client.pipeline(transaction=False)
+        for key, ttl in zip(keys, ttls.execute()):
+            if ttl > 0:
+                compact.import_entry(pipe, key[len(prefix):], status, ttl)
+                migrated += 1
+        pipe.execute()
+    return migrated
+
+
+def delete_legacy(pattern, batch):
+    deleted = 0
+    for _, keys in _scan(pattern, batch):
+        deleted += redis_client.delete(*keys)
+    return deleted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["migrate", "delete-legacy", "sweep"])
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if not redis_client:
+        raise SystemExit("REDIS_URL is not configured")
+
+    compact = CompactSessionStore(
+        redis_binary_client,
+        bucket_bits=settings.SESSION_STORE_BUCKET_BITS,
+        field_ttl=settings.SESSION_STORE_FIELD_TTL,
+    )
+
+    started = time.perf_counter()
+    if args.command == "migrate":
+        # Revocations first: import_entry never overwrites, so a session that
+        # has both legacy keys ends up revoked
+        revoked = migrate(compact, LegacySessionStore.REVOKED_KEY, REVOKED, args.batch)
+        active = migrate(compact, LegacySessionStore.ACTIVE_KEY, ACTIVE, args.batch)
+        print(f"migrated {revoked} revoked, {active} active sessions "
+              f"in {time.perf_counter() - started:.1f}s")
+    elif args.command == "delete-legacy":
+        deleted = sum(
+            delete_legacy(pattern, args.batch)
+            for pattern in (LegacySessionStore.REVOKED_KEY, LegacySessionStore.ACTIVE_KEY)
+        )
+        print(f"deleted {deleted} legacy keys in {time.perf_counter() - started:.1f}s")
+    else:
+        print(f"removed {compact.sweep(args.batch)} expired sessions")
+
+
+if __name__ == "__main__":
+    main()
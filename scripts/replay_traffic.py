@@ -0,0 +1,432 @@
+# scripts/replay_traffic.py
+#
+# Replays traffic recorded by the capture middleware (CAPTURE_ENABLED=true)
+# against a local instance: same endpoint and grant type mix, same
+# inter-arrival times (scaled by --speed), fresh credentials from a seeded
+# user and client. Reports latency percentiles per endpoint.
+#
+#   python -m scripts.replay_traffic seed capture/
+#   python -m scripts.replay_traffic run capture/ --base-url http://localhost:8000 --speed 1
+#
+# `seed` writes the replay user(s) and client straight into DATABASE_URL;
+# point it at the local database only. Captures are sampled, so at
+# CAPTURE_SAMPLE_RATE=0.01 use --speed 100 for production-level arrival rates.
+#
+# The schedule is open-loop: requests are sent at their scheduled time
+# whether or not earlier ones have returned, and latency is measured from
+# the scheduled time, so a server that falls behind is charged for the
+# queueing it causes.
+
+import argparse
+import base64
+import glob
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import queue
+import secrets
+import statistics
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+API = "/api/v1"
+
+REPLAY_CLIENT_ID = "replay-client"
+REPLAY_CLIENT_SECRET = "replay-client-secret"
+REPLAY_REDIRECT_URI = "http://localhost/replay/callback"
+REPLAY_EMAIL = "replay@example.com"
+# Each replayed global logout needs a user of its own
+REPLAY_LOGOUT_EMAIL = "replay-logout-{n}@example.com"
+REPLAY_PASSWORD = "replay-password"
+
+# Credentials expire (codes after 10 minutes, access tokens after
+# ACCESS_TOKEN_EXPIRE_SECONDS), so requests are prepared at most PLAN_AHEAD
+# seconds before they are sent and the shared token is re-minted after
+# SHARED_MAX_AGE: nothing is older than 6 minutes when it is used.
+PLAN_AHEAD = 60.0
+SHARED_MAX_AGE = 300.0
+
+
+def load_records(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, "*.jsonl")))
+            files += sorted(glob.glob(os.path.join(path, "*.jsonl.gz")))
+        else:
+            files.append(path)
+
+    records = []
+    for name in files:
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(name, "rt", encoding="utf-8") as f:
+            records += [json.loads(line) for line in f if line.strip()]
+
+    records = [r for r in records if r.get("event") == "request"]
+    records.sort(key=lambda r: r["arrival"])
+    return records
+
+
+def _param(record, name, default=None):
+    for part in ("form", "query"):
+        value = (record.get(part) or {}).get(name)
+        if value:
+            return value
+    return default
+
+
+def _is_logout(record):
+    return record["endpoint"] == f"{API}/sso/logout"
+
+
+# ------------------------
+# Seed
+# ------------------------
+
+def seed(args):
+    from app.db.session import SessionLocal
+    from app.models.client import OAuthClient
+    from app.models.user import User
+    from app.utils.password import hash_password
+
+    records = load_records(args.paths)
+    scopes = sorted({s for r in records for s in (_param(r, "scope") or "").split()} | {"read"})
+    logouts = sum(1 for r in records if _is_logout(r))
+
+    db = SessionLocal()
+    password_hash = hash_password(REPLAY_PASSWORD)
+
+    emails = [REPLAY_EMAIL] + [REPLAY_LOGOUT_EMAIL.format(n=n) for n in range(logouts)]
+    existing = {e for (e,) in db.query(User.email).filter(User.email.in_(emails))}
+    db.add_all(User(email=e, password_hash=password_hash) for e in emails if e not in existing)
+
+    client = db.query(OAuthClient).filter_by(client_id=REPLAY_CLIENT_ID).first()
+    if not client:
+        client = OAuthClient(client_id=REPLAY_CLIENT_ID)
+        db.add(client)
+    client.client_secret_hash = hash_password(REPLAY_CLIENT_SECRET)
+    client.redirect_uris = [REPLAY_REDIRECT_URI]
+    client.allowed_grant_types = ["authorization_code", "refresh_token", "client_credentials"]
+    client.allowed_scopes = scopes
+
+    db.commit()
+    db.close()
+    print(f"seeded {len(emails)} users and client {REPLAY_CLIENT_ID} (scopes: {' '.join(scopes)})")
+
+
+# ------------------------
+# Preparation
+# ------------------------
+
+class Planned(NamedTuple):
+    at: float                  # seconds after replay start
+    endpoint: str
+    label: str                 # endpoint, plus grant type for /token
+    method: str
+    path: str
+    headers: dict
+    body: Optional[bytes]
+
+
+class Replayer:
+    def __init__(self, base_url: str, timeout: float):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.https = url.scheme == "https"
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def request(self, method, path, headers=None, body=None):
+        """Keep-alive request per thread; redirects are not followed."""
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                return response.status, response.getheaders(), response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # Server closed an idle keep-alive connection
+                conn.close()
+                self._local.conn = None
+                if attempt == 2:
+                    raise
+
+    def form(self, path, fields, headers=None):
+        headers = {"Content-Type": "application/x-www-form-urlencoded", **(headers or {})}
+        return self.request("POST", path, headers, urlencode(fields).encode())
+
+    # --- credentials --------------------------------------------------
+
+    def login(self, email):
+        status, headers, _ = self.form(
+            f"{API}/sso/login", {"email": email, "password": REPLAY_PASSWORD}
+        )
+        for name, value in headers:
+            # The session cookie is the only one login sets
+            if name.lower() == "set-cookie":
+                return value.split(";", 1)[0]
+        raise RuntimeError(f"login as {email} failed ({status}); run `seed` first")
+
+    def authorize(self, cookie, scope, pkce=False):
+        verifier = secrets.token_urlsafe(48) if pkce else None
+        query = {
+            "response_type": "code",
+            "client_id": REPLAY_CLIENT_ID,
+            "redirect_uri": REPLAY_REDIRECT_URI,
+            "scope": scope,
+        }
+        if pkce:
+            digest = hashlib.sha256(verifier.encode()).digest()
+            query["code_challenge"] = base64.urlsafe_b64encode(digest).decode().rstrip("=")
+            query["code_challenge_method"] = "S256"
+
+        status, headers, _ = self.request(
+            "GET", f"{API}/oauth/authorize?{urlencode(query)}", {"Cookie": cookie}
+        )
+        location = dict((k.lower(), v) for k, v in headers).get("location", "")
+        code = parse_qs(urlsplit(location).query).get("code")
+        if not code:
+            raise RuntimeError(f"authorize failed ({status})")
+        return code[0], verifier
+
+    def exchange(self, code, verifier=None):
+        fields = {
+            "grant_type": "authorization_code",
+            "client_id": REPLAY_CLIENT_ID,
+            "client_secret": REPLAY_CLIENT_SECRET,
+            "code": code,
+            "redirect_uri": REPLAY_REDIRECT_URI,
+        }
+        if verifier:
+            fields["code_verifier"] = verifier
+        status, _, body = self.form(f"{API}/oauth/token", fields)
+        if status != 200:
+            raise RuntimeError(f"code exchange failed ({status})")
+        return json.loads(body)
+
+
+def plan(records, replayer: Replayer, speed: float, skipped: Counter):
+    """
+    Turn captured shapes into concrete requests, in schedule order.
+    Everything consumed by a request (authorization codes, refresh tokens
+    to revoke, sessions to log out) is obtained here, when the request is
+    prepared; unreplayable records are counted in skipped.
+    """
+    cookie = replayer.login(REPLAY_EMAIL)
+    shared = minted = None
+    logout_users = iter(range(len(records)))
+    start = records[0]["arrival"] if records else 0
+
+    for record in records:
+        if shared is None or time.perf_counter() - minted > SHARED_MAX_AGE:
+            shared = replayer.exchange(*replayer.authorize(cookie, "read"))
+            bearer = {"Authorization": f"Bearer {shared['access_token']}"}
+            minted = time.perf_counter()
+
+        endpoint, method = record["endpoint"], record["method"]
+        form = record.get("form") or {}
+        scope = _param(record, "scope", "read")
+        label, headers, body, path = endpoint, {}, None, endpoint
+
+        if endpoint == f"{API}/oauth/token":
+            grant_type = form.get("grant_type") or "unknown"
+            label = f"{endpoint} [{grant_type}]"
+            fields = {"grant_type": grant_type, "client_id": REPLAY_CLIENT_ID}
+            if grant_type == "authorization_code":
+                code, verifier = replayer.authorize(cookie, scope, pkce="code_verifier" in form)
+                fields.update(
+                    client_secret=REPLAY_CLIENT_SECRET,
+                    code=code,
+                    redirect_uri=REPLAY_REDIRECT_URI,
+                )
+                if verifier:
+                    fields["code_verifier"] = verifier
+            elif grant_type == "refresh_token":
+                fields["refresh_token"] = shared["refresh_token"]
+            elif grant_type == "client_credentials":
+                fields.update(client_secret=REPLAY_CLIENT_SECRET, scope=scope)
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            body = urlencode(fields).encode()
+
+        elif endpoint == f"{API}/oauth/authorize":
+            query = {
+                "response_type": _param(record, "response_type", "code"),
+                "client_id": REPLAY_CLIENT_ID,
+                "redirect_uri": REPLAY_REDIRECT_URI,
+                "scope": scope,
+            }
+            path = f"{endpoint}?{urlencode(query)}"
+            if record.get("session_cookie"):
+                headers = {"Cookie": cookie}
+
+        elif endpoint == f"{API}/oauth/introspect":
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            body = urlencode({"token": shared["access_token"]}).encode()
+
+        elif endpoint == f"{API}/oauth/revoke":
+            # Always a dedicated refresh token: revoking an access token
+            # would revoke the shared session mid-replay
+            own = replayer.exchange(*replayer.authorize(cookie, "read"))
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            body = urlencode({"token": own["refresh_token"]}).encode()
+
+        elif endpoint == f"{API}/sso/login":
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            body = urlencode({"email": REPLAY_EMAIL, "password": REPLAY_PASSWORD}).encode()
+
+        elif _is_logout(record):
+            email = REPLAY_LOGOUT_EMAIL.format(n=next(logout_users))
+            headers = {"Cookie": replayer.login(email)}
+
+        elif endpoint == f"{API}/sso/sessions":
+            path = f"{endpoint}?limit=50"
+            headers = {"Cookie": cookie}
+
+        elif "{" in endpoint or endpoint == "unmatched" or method not in ("GET", "HEAD"):
+            # Needs identifiers or a body the capture doesn't keep
+            skipped[endpoint] += 1
+            continue
+
+        elif record.get("bearer"):
+            headers = dict(bearer)
+
+        yield Planned((record["arrival"] - start) / speed, endpoint, label, method, path, headers, body)
+
+
+# ------------------------
+# Replay
+# ------------------------
+
+def run(args):
+    records = load_records(args.paths)
+    if args.limit:
+        records = records[: args.limit]
+    if not records:
+        sys.exit("no captured requests found")
+
+    replayer = Replayer(args.base_url, timeout=args.timeout)
+    skipped = Counter()
+    requests = plan(records, replayer, args.speed, skipped)
+
+    # The first PLAN_AHEAD seconds are prepared before the clock starts,
+    # the rest by a thread that stays that far ahead of the schedule
+    prepared = time.perf_counter()
+    window = queue.Queue()
+    for request in requests:
+        window.put(request)
+        if request.at >= PLAN_AHEAD:
+            break
+    duration = (records[-1]["arrival"] - records[0]["arrival"]) / args.speed
+    print(
+        f"prepared {window.qsize()} requests in {time.perf_counter() - prepared:.1f}s, "
+        f"replaying over {duration:.1f}s at {args.speed}x",
+        file=sys.stderr,
+    )
+
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    lock = threading.Lock()
+
+    def send(request: Planned, scheduled: float):
+        try:
+            status = replayer.request(request.method, request.path, request.headers, request.body)[0]
+        except Exception:
+            status = "error"
+        elapsed = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            latencies[request.label].append(elapsed)
+            statuses[request.label][status] += 1
+
+    failed = []
+
+    def prepare():
+        try:
+            for request in requests:
+                delay = started + request.at - PLAN_AHEAD - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                window.put(request)
+        except Exception as exc:
+            failed.append(exc)
+        finally:
+            window.put(None)
+
+    started = time.perf_counter()
+    preparer = threading.Thread(target=prepare, name="replay-prepare", daemon=True)
+    preparer.start()
+
+    sent = 0
+    max_lag = 0.0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for request in iter(window.get, None):
+            sent += 1
+            scheduled = started + request.at
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+            pool.submit(send, request, scheduled)
+    wall = time.perf_counter() - started
+    if failed:
+        raise failed[0]
+
+    print(
+        f"\n{'endpoint':<52} {'n':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses"
+    )
+    for label in sorted(latencies):
+        samples = sorted(latencies[label])
+        q = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+        codes = " ".join(f"{code}:{n}" for code, n in sorted(statuses[label].items(), key=str))
+        print(
+            f"{label:<52} {len(samples):>6} {q[49]:8.1f} {q[89]:8.1f} {q[98]:8.1f} "
+            f"{samples[-1]:8.1f}  {codes}"
+        )
+
+    print(
+        f"\n{sent} requests in {wall:.1f}s ({sent / wall:,.1f} req/s), "
+        f"max schedule lag {max_lag * 1000:.1f} ms"
+    )
+    for endpoint, n in skipped.items():
+        print(f"skipped {n} x {endpoint} (not replayable)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured traffic against a local instance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="create the replay user(s) and client")
+    seed_parser.add_argument("paths", nargs="+", help="capture files or directories")
+
+    run_parser = commands.add_parser("run", help="replay and report latencies")
+    run_parser.add_argument("paths", nargs="+", help="capture files or directories")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--speed", type=float, default=1.0, help="time compression factor")
+    run_parser.add_argument("--concurrency", type=int, default=64)
+    run_parser.add_argument("--timeout", type=float, default=10.0)
+    run_parser.add_argument("--limit", type=int, help="replay only the first N requests")
+
+    args = parser.parse_args(argv)
+    if args.command == "seed":
+        seed(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# scripts/rotate_client_secret.py
+
+import secrets
+import sys
+from app.db.session import SessionLocal
+from app.models.client import OAuthClient
+from app.utils.password import hash_password
+from app.services.client_registry import client_registry
+from app.services.client_token_cache import invalidate_client
+
+client_id = sys.argv[1] if len(sys.argv) > 1 else "example_client"
+
+db = SessionLocal()
+
+client = db.query(OAuthClient).filter_by(client_id=client_id).first()
+if not client:
+    sys.exit(f"Unknown client: {client_id}")
+
+client_secret = secrets.token_urlsafe(32)
+client.client_secret_hash = hash_password(client_secret)
+db.commit()
+
+# Workers must stop accepting the old secret now, not after their
+# registry ttl; cached client_credentials tokens were minted for it
+client_registry.invalidate(client.client_id)
+invalidate_client(client.client_id)
+
+print("CLIENT_ID:", client.client_id)
+print("CLIENT_SECRET:", client_secret)
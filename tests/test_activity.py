@@ -0,0 +1,137 @@
+import uuid
+from datetime import timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.routing import PrimaryPins, ReplicaPool, RoutingSession
+from app.db.sharding import Shards, create_shard_schema
+from app.models.activity import ClientActivity, SessionActivity
+from app.services.activity import ActivityTracker, DatabaseActivitySink
+
+
+class RecordingSink:
+    def __init__(self, fail=0):
+        self.writes = []
+        self.fail = fail
+
+    def write(self, sessions, clients):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("database unavailable")
+        self.writes.append((sessions, clients))
+        return {}, {}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def tracker():
+    sink = RecordingSink()
+    tracker = ActivityTracker(lambda: sink, flush_interval=3600, max_keys=3)
+    tracker.start()
+    yield tracker, sink
+    tracker.stop()
+
+
+def test_record_coalesces_until_flush(tracker):
+    tracker, sink = tracker
+    for _ in range(3):
+        tracker.record("sid-1", "client-a")
+    tracker.record("sid-2", "client-a")
+
+    assert sink.writes == []
+    tracker.flush()
+
+    (sessions, clients), = sink.writes
+    assert {k: v[1] for k, v in sessions.items()} == {"sid-1": 3, "sid-2": 1}
+    assert clients["client-a"][1] == 4
+    assert tracker.stats()["pending"] == 0
+
+
+def test_pending_keys_are_bounded(tracker):
+    tracker, sink = tracker
+    for n in range(3):
+        tracker.record(f"sid-{n}", None)
+    tracker.record("sid-0", None)       # known key, still counted
+    tracker.record("sid-3", "client-a")
+
+    assert tracker.stats()["dropped"] == 2
+    tracker.flush()
+    assert sink.writes[0][0]["sid-0"][1] == 2
+
+
+def test_failed_write_kept_for_next_flush():
+    sink = RecordingSink(fail=1)
+    tracker = ActivityTracker(lambda: sink, flush_interval=3600, max_keys=10)
+    tracker.start()
+    tracker.record("sid-1", "client-a")
+    tracker.flush()
+    tracker.record("sid-1", "client-a")
+    tracker.flush()
+    tracker.stop()
+
+    (sessions, clients), = sink.writes
+    assert sessions["sid-1"][1] == 2
+    assert tracker.stats()["failed"] == 2
+
+
+def test_upsert_adds_counts_and_keeps_latest(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/activity.db")
+    Base.metadata.create_all(engine, tables=[SessionActivity.__table__, ClientActivity.__table__])
+    factory = sessionmaker(
+        class_=RoutingSession,
+        primary=engine,
+        replicas=ReplicaPool([], eject_seconds=30),
+        pins=PrimaryPins(seconds=5),
+    )
+    sink = DatabaseActivitySink(factory, batch_size=1)
+    sid = str(uuid.uuid4())
+
+    sink.write({sid: [2000.0, 3]}, {"client-a": [2000.0, 3], "client-b": [1000.0, 1]})
+    sink.write({sid: [1500.0, 2]}, {"client-a": [3000.0, 1]})
+
+    # sqlite returns naive UTC datetimes
+    with factory() as db:
+        session = db.get(SessionActivity, uuid.UUID(sid))
+        assert session.use_count == 5
+        assert session.last_used_at.replace(tzinfo=timezone.utc).timestamp() == 2000.0
+        client = db.get(ClientActivity, "client-a")
+        assert client.use_count == 4
+        assert client.last_used_at.replace(tzinfo=timezone.utc).timestamp() == 3000.0
+
+
+def test_failed_shard_does_not_hold_back_the_others(tmp_path):
+    engines = [create_engine(f"sqlite:///{tmp_path}/shard{n}.db") for n in range(3)]
+    Base.metadata.create_all(engines[0], tables=[SessionActivity.__table__, ClientActivity.__table__])
+    create_shard_schema(engines[1])
+    # Shard 2 has no session_activity table: every write to it fails
+    shards = Shards(engines)
+    factory = sessionmaker(
+        class_=RoutingSession,
+        primary=engines[0],
+        replicas=ReplicaPool([], eject_seconds=30),
+        pins=PrimaryPins(seconds=5),
+        shards=shards,
+    )
+    tracker = ActivityTracker(
+        lambda: DatabaseActivitySink(factory, batch_size=10), flush_interval=3600, max_keys=10
+    )
+    tracker.start()
+    sids = [str(shards.new_session_id(shard)) for shard in range(3)]
+    for sid in sids:
+        tracker.record(sid, "client-a")
+    tracker.flush()
+    tracker.flush()
+    tracker.stop()
+
+    with factory() as db:
+        # Written once, not again by the retries of shard 2
+        for sid in sids[:2]:
+            assert db.for_session(sid).get(SessionActivity, uuid.UUID(sid)).use_count == 1
+        assert db.get(ClientActivity, "client-a").use_count == 3
+    assert tracker.stats()["pending"] == 1
+    assert tracker.stats()["written"] == 3
@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from app.core.keys import Keyring
+from app.main import create_app
+
+
+def test_create_app_returns_new_instances():
+    first = create_app()
+    second = create_app()
+
+    assert first is not second
+    assert first.router is not second.router
+
+
+def test_shared_resources_stopped_by_last_app_only(monkeypatch):
+    from app import main
+
+    stopped = []
+    monkeypatch.setattr(main, "stop_resources", lambda: stopped.append(True))
+
+    with TestClient(create_app()) as first:
+        with TestClient(create_app()):
+            pass
+        # The second app's shutdown left the engines and pools alone
+        assert stopped == []
+        assert first.get("/health").json()["status"] == "ok"
+    assert stopped == [True]
+
+
+def test_app_lifespan_startup_and_shutdown():
+    with TestClient(create_app()) as client:
+        assert client.get("/health").json()["status"] == "ok"
+
+
+def test_keyring_reads_keys_lazily(tmp_path):
+    keyring = Keyring(str(tmp_path / "missing"), "test-key")
+
+    # Nothing is read until the keys are needed
+    assert keyring.kid == "test-key"
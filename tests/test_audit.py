@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import threading
+
+from app.services.audit import AuditPipeline, JsonlSink
+
+
+def test_audit_events_written_as_jsonl(tmp_path):
+    pipeline = AuditPipeline(
+        lambda: JsonlSink(str(tmp_path), max_bytes=1024 * 1024),
+        max_queue=100,
+        batch_size=10,
+        flush_interval=0.05,
+    )
+    pipeline.start()
+    for i in range(25):
+        pipeline.emit("token.issued", client_id="example_client", n=i)
+    pipeline.stop()
+
+    lines = (tmp_path / f"audit-{os.getpid()}-current.jsonl").read_text().splitlines()
+    assert [json.loads(line)["n"] for line in lines] == list(range(25))
+    assert pipeline.stats()["written"] == 25
+
+
+def test_audit_segments_rotated_and_compressed(tmp_path):
+    pipeline = AuditPipeline(
+        lambda: JsonlSink(str(tmp_path), max_bytes=200),
+        max_queue=100,
+        batch_size=5,
+        flush_interval=0.05,
+    )
+    pipeline.start()
+    for i in range(20):
+        pipeline.emit("login.succeeded", user_id=str(i))
+    pipeline.stop()
+
+    segments = sorted(tmp_path.glob(f"audit-{os.getpid()}-*.jsonl.gz"))
+    assert segments
+    with gzip.open(segments[0], "rt") as f:
+        assert json.loads(f.readline())["event"] == "login.succeeded"
+
+
+def test_audit_drops_under_backpressure():
+    release = threading.Event()
+
+    class BlockedSink:
+        def write(self, events):
+            release.wait()
+
+        def close(self):
+            pass
+
+    pipeline = AuditPipeline(BlockedSink, max_queue=5, batch_size=1, flush_interval=0.05)
+    pipeline.start()
+    for _ in range(50):
+        pipeline.emit("token.issued")
+
+    assert pipeline.stats()["dropped"] >= 40
+
+    release.set()
+    pipeline.stop()
+
+
+def test_audit_files_are_per_process(tmp_path):
+    sink = JsonlSink(str(tmp_path), max_bytes=1024 * 1024)
+
+    pid = os.fork()
+    if pid == 0:
+        child = JsonlSink(str(tmp_path), max_bytes=1024 * 1024)
+        child.write([{"event": "child"}])
+        child.rotate()
+        child.close()
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    sink.write([{"event": "parent"}])
+    sink.close()
+
+    lines = (tmp_path / f"audit-{os.getpid()}-current.jsonl").read_text().splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["parent"]
+    assert list(tmp_path.glob(f"audit-{pid}-*.jsonl.gz"))
+
+
+def test_files_of_exited_workers_rotated_on_startup(tmp_path):
+    pid = os.fork()
+    if pid == 0:
+        JsonlSink(str(tmp_path), max_bytes=1024 * 1024).write([{"event": "restarted"}])
+        os._exit(0)
+    os.waitpid(pid, 0)
+    # The parent is alive: its file stays where it is
+    (tmp_path / f"audit-{os.getppid()}-current.jsonl").write_text("{}\n")
+
+    JsonlSink(str(tmp_path), max_bytes=1024 * 1024)
+
+    assert not (tmp_path / f"audit-{pid}-current.jsonl").exists()
+    segment, = tmp_path.glob(f"audit-{pid}-*.jsonl.gz")
+    with gzip.open(segment, "rt") as f:
+        assert json.loads(f.readline())["event"] == "restarted"
+    assert (tmp_path / f"audit-{os.getppid()}-current.jsonl").exists()
@@ -0,0 +1,139 @@
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.db.session import engine
+from app.utils.password import hash_password
+from scripts import bulk_provision
+from scripts.bulk_provision import ClientsTable, UsersTable, _pg_array, copy_batch, hash_secrets
+
+
+def test_pg_array_escapes_quotes_and_backslashes():
+    assert _pg_array([]) == "{}"
+    assert _pg_array(["read", "write"]) == '{"read","write"}'
+    assert _pg_array(['a"b', "c\\d", "e f,g"]) == '{"a\\"b","c\\\\d","e f,g"}'
+
+
+def test_user_row_keeps_email_as_given():
+    row = UsersTable.to_row({"email": " Jane.Doe@Example.com ", "is_active": "false"}, "hash")
+
+    assert row[1:4] == ["Jane.Doe@Example.com", "hash", False]
+    assert row[0] and row[4] is None
+
+
+def test_user_row_requires_email_and_secret():
+    with pytest.raises(ValueError):
+        UsersTable.to_row({"email": "a@example.com"}, None)
+    with pytest.raises(ValueError):
+        UsersTable.to_row({"email": " "}, "hash")
+
+
+def test_client_row_lists_and_defaults():
+    row = ClientsTable.to_row(
+        {"client_id": "app", "redirect_uris": "https://a/cb https://b/cb", "allowed_scopes": ["read"]},
+        "hash",
+    )
+
+    assert row[1:6] == ["app", "hash", '{"https://a/cb","https://b/cb"}', "{}", '{"read"}']
+    assert row[6] is True
+    assert row[7] == "jwt"
+
+    with pytest.raises(ValueError):
+        ClientsTable.to_row({"redirect_uris": "https://a/cb"}, None)
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="COPY needs PostgreSQL")
+def test_client_copied_without_optional_columns():
+    client_id = f"bulk-{uuid.uuid4().hex[:8]}"
+    conn = engine.raw_connection()
+    try:
+        row = ClientsTable.to_row({"client_id": client_id, "redirect_uris": "https://a/cb"}, None)
+        assert copy_batch(conn, ClientsTable, [row]) == 1
+
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT access_token_format, is_confidential, allowed_scopes "
+                "FROM oauth_clients WHERE client_id = %s",
+                (client_id,),
+            )
+            assert cursor.fetchone() == ("jwt", True, [])
+            cursor.execute("DELETE FROM oauth_clients WHERE client_id = %s", (client_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_hash_secrets_passes_hashes_through():
+    existing = hash_password("imported")
+    records = [
+        {"email": "a@example.com", "password_hash": existing},
+        {"email": "b@example.com", "password": "plaintext"},
+        {"email": "c@example.com"},
+    ]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        hashes = hash_secrets(pool, UsersTable, records)
+
+    assert hashes[0] == existing
+    assert hashes[1] != "plaintext" and bulk_provision.pwd_context.verify("plaintext", hashes[1])
+    assert hashes[2] is None
+
+
+def test_hash_secrets_rejects_unknown_hash_format():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(ValueError):
+            hash_secrets(pool, UsersTable, [{"email": "a@example.com", "password_hash": "md5:abc"}])
+
+
+def test_import_resumes_from_checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "users.jsonl"
+    password_hash = hash_password("imported")
+    path.write_text(
+        "".join(
+            json.dumps({"email": f"u{n}@example.com", "password_hash": password_hash}) + "\n"
+            for n in range(5)
+        )
+    )
+
+    copied = []
+
+    def copy_batch(conn, table, rows):
+        if len(copied) == 1 and not resumed:
+            raise RuntimeError("connection lost")
+        copied.append([row[1] for row in rows])
+        return len(rows)
+
+    monkeypatch.setattr(bulk_provision, "copy_batch", copy_batch)
+    monkeypatch.setattr(bulk_provision, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(
+        bulk_provision,
+        "engine",
+        SimpleNamespace(raw_connection=lambda: SimpleNamespace(close=lambda: None)),
+    )
+    args = SimpleNamespace(
+        table="users",
+        file=str(path),
+        format="jsonl",
+        batch=2,
+        workers=1,
+        checkpoint=None,
+        restart=False,
+    )
+
+    resumed = False
+    with pytest.raises(RuntimeError):
+        bulk_provision.import_file(args)
+    assert bulk_provision.read_checkpoint(str(path) + ".checkpoint") == 2
+
+    resumed = True
+    bulk_provision.import_file(args)
+
+    assert copied == [
+        ["u0@example.com", "u1@example.com"],
+        ["u2@example.com", "u3@example.com"],
+        ["u4@example.com"],
+    ]
+    assert bulk_provision.read_checkpoint(str(path) + ".checkpoint") == 5
@@ -0,0 +1,60 @@
+from fastapi import FastAPI, Form
+from fastapi.testclient import TestClient
+
+from app.services.capture import CaptureMiddleware
+
+
+class ListPipeline:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, **fields):
+        self.events.append(dict(fields, event=event))
+
+
+def _client(sample_rate=1.0):
+    app = FastAPI()
+
+    @app.post("/oauth/token")
+    def token(grant_type: str = Form(...), client_secret: str = Form(...)):
+        return {"ok": True}
+
+    @app.get("/sessions/{session_id}")
+    def session(session_id: str):
+        return {"id": session_id}
+
+    pipeline = ListPipeline()
+    app.add_middleware(CaptureMiddleware, pipeline=pipeline, sample_rate=sample_rate)
+    return TestClient(app), pipeline
+
+
+def test_capture_records_shape_without_secrets():
+    client, pipeline = _client()
+
+    client.post("/oauth/token", data={"grant_type": "client_credentials", "client_secret": "s3cret"})
+
+    (event,) = pipeline.events
+    assert event["endpoint"] == "/oauth/token"
+    assert event["status"] == 200
+    assert event["form"] == {"grant_type": "client_credentials", "client_secret": None}
+    assert "s3cret" not in repr(event)
+
+
+def test_capture_uses_route_template():
+    client, pipeline = _client()
+
+    client.get("/sessions/4b1c8a52", headers={"Authorization": "Bearer abc.def"})
+
+    (event,) = pipeline.events
+    assert event["endpoint"] == "/sessions/{session_id}"
+    assert event["bearer"] is True
+    assert "4b1c8a52" not in repr(event)
+    assert "abc.def" not in repr(event)
+
+
+def test_capture_sampling_off():
+    client, pipeline = _client(sample_rate=0.0)
+
+    client.get("/sessions/1")
+
+    assert pipeline.events == []
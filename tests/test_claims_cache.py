@@ -0,0 +1,84 @@
+import uuid
+
+import jwt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.jwt import create_id_token
+from app.core.keys import keyring
+from app.models.user import User
+from app.services import claims_cache as claims_module
+from app.services.claims_cache import ClaimsCache, claims_for_scope, user_claims
+
+
+def test_local_lru_evicts_oldest(monkeypatch):
+    # Local level only
+    monkeypatch.setattr(claims_module, "redis_client", None)
+    loads = []
+
+    def loader(user_id):
+        loads.append(user_id)
+        return {"sub": user_id}
+
+    cache = ClaimsCache(ttl=60, local_ttl=60, local_size=2, loader=loader)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")   # evicts b, the least recently used
+
+    cache.get("a")
+    cache.get("b")
+    assert loads == ["a", "b", "c", "b"]
+
+
+def test_claims_released_per_scope():
+    claims = {"sub": "u", "email": "u@example.com", "email_verified": True, "name": "U", "locale": None}
+
+    assert claims_for_scope(claims, {"openid"}) == {}
+    assert claims_for_scope(claims, {"openid", "email"}) == {
+        "email": "u@example.com",
+        "email_verified": True,
+    }
+    assert claims_for_scope(claims, {"openid", "profile"}) == {"name": "U"}
+
+
+def test_user_update_invalidates_cached_claims(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/users.db")
+    User.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    def loader(user_id):
+        with Session() as db:
+            return user_claims(db.get(User, uuid.UUID(user_id)))
+
+    cache = ClaimsCache(ttl=60, local_ttl=60, local_size=10, loader=loader)
+    monkeypatch.setattr(claims_module, "claims_cache", cache)
+
+    with Session() as db:
+        user = User(email="a@example.com", password_hash="x", name="Before")
+        db.add(user)
+        db.commit()
+        user_id = str(user.id)
+
+        assert cache.get(user_id)["name"] == "Before"
+
+        user.name = "After"
+        db.commit()
+
+    assert cache.get(user_id)["name"] == "After"
+
+
+def test_id_token_claims():
+    token = create_id_token(
+        subject="user-1",
+        client_id="client-1",
+        access_token="access-token",
+        nonce="n-0S6_WzA2Mj",
+        session_id="sid-1",
+    )
+
+    claims = jwt.decode(token, keyring.public_key, algorithms=["RS256"], audience="client-1")
+    assert claims["sub"] == "user-1"
+    assert claims["nonce"] == "n-0S6_WzA2Mj"
+    assert claims["sid"] == "sid-1"
+    assert len(claims["at_hash"]) == 22
@@ -0,0 +1,33 @@
+from app.services.client_policy import ClientPolicy, normalize_scope, parse_scope
+
+
+def _policy():
+    return ClientPolicy.compile(
+        grant_types=["authorization_code", "refresh_token"],
+        scopes=["read", "write"],
+        redirect_uris=["https://app.example.com/callback"],
+    )
+
+
+def test_policy_grants():
+    policy = _policy()
+    assert policy.allows_grant("authorization_code")
+    assert not policy.allows_grant("client_credentials")
+
+
+def test_policy_redirect_exact_match():
+    policy = _policy()
+    assert policy.allows_redirect("https://app.example.com/callback")
+    assert not policy.allows_redirect("https://app.example.com/callback/")
+
+
+def test_policy_scopes():
+    policy = _policy()
+    assert policy.allows_scopes(parse_scope("write read"))
+    assert not policy.allows_scopes(parse_scope("read admin"))
+
+
+def test_scope_normalized():
+    assert normalize_scope("write read write") == "read write"
+    assert normalize_scope(None) == ""
+
@@ -0,0 +1,78 @@
+import pytest
+
+from app.models.client import OAuthClient
+from app.services import client_registry as registry_module
+from app.services.client_registry import ClientRegistry
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class FakeDB:
+    def __init__(self):
+        self.reads = 0
+        self.secret_hash = "old"
+
+    def read(self, query):
+        return query()
+
+    def query(self, model):
+        return self
+
+    def filter_by(self, **kwargs):
+        return self
+
+    def first(self):
+        self.reads += 1
+        return OAuthClient(client_id="rotated", client_secret_hash=self.secret_hash)
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.mgets = 0
+
+    def mget(self, *args, **kwargs):
+        self.mgets += 1
+        return super().mget(*args, **kwargs)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = CountingRedis(decode_responses=True)
+    monkeypatch.setattr(registry_module, "redis_client", client)
+    return client
+
+
+def test_registry_reloads_invalidated_client(redis):
+    db = FakeDB()
+    # One registry per worker, ttl long enough to never expire here
+    worker_a = ClientRegistry(ttl=3600, check_interval=0)
+    worker_b = ClientRegistry(ttl=3600, check_interval=0)
+
+    assert worker_a.get(db, "rotated").client_secret_hash == "old"
+    worker_a.get(db, "rotated")
+    assert db.reads == 1
+
+    db.secret_hash = "new"
+    worker_b.invalidate("rotated")
+    assert worker_a.get(db, "rotated").client_secret_hash == "new"
+
+
+def test_registry_checks_version_once_per_interval(redis, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(registry_module.time, "monotonic", lambda: clock[0])
+    db = FakeDB()
+    worker = ClientRegistry(ttl=3600, check_interval=1.0)
+
+    worker.get(db, "rotated")
+    for _ in range(100):
+        worker.get(db, "rotated")
+    assert redis.mgets == 1
+
+    db.secret_hash = "new"
+    ClientRegistry(ttl=3600, check_interval=1.0).invalidate("rotated")
+    assert worker.get(db, "rotated").client_secret_hash == "old"
+
+    clock[0] += 1.0
+    assert worker.get(db, "rotated").client_secret_hash == "new"
+    assert redis.mgets == 2
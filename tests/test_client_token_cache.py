@@ -0,0 +1,52 @@
+from app.core.config import settings
+
+
+def _client_credentials(client, scope):
+    return client.post(
+        "/api/v1/oauth/token",
+        data={
+            "grant_type": "client_credentials",
+            "client_id": "example_client",
+            "client_secret": "secret",
+            "scope": scope,
+        }
+    )
+
+
+def test_client_credentials_token_reused(client, monkeypatch):
+    monkeypatch.setattr(settings, "CLIENT_CREDENTIALS_CACHE_ENABLED", True)
+
+    first = _client_credentials(client, "read write")
+    second = _client_credentials(client, "write read write")
+
+    assert first.status_code == 200
+    assert second.json()["access_token"] == first.json()["access_token"]
+    assert second.json()["scope"] == "read write"
+
+
+def test_client_credentials_cache_invalidated(client, monkeypatch):
+    import time
+    from app.services.client_token_cache import invalidate_client
+
+    monkeypatch.setattr(settings, "CLIENT_CREDENTIALS_CACHE_ENABLED", True)
+
+    first = _client_credentials(client, "read")
+    invalidate_client("example_client")
+    time.sleep(1)  # same-second tokens are byte-identical
+    second = _client_credentials(client, "read")
+
+    assert second.status_code == 200
+    assert second.json()["access_token"] != first.json()["access_token"]
+
+
+def test_client_credentials_token_usable(client):
+    token = _client_credentials(client, "read").json()["access_token"]
+
+    response = client.post("/api/v1/oauth/introspect", data={"token": token})
+    assert response.json()["active"] is True
+    assert response.json()["client_id"] == "example_client"
+    assert response.json()["sub"] == "example_client"
+
+    response = client.get("/api/v1/userinfo/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["sub"] == "example_client"
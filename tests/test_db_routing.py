@@ -0,0 +1,93 @@
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+
+from app.db.routing import PrimaryPins, ReplicaPool, RoutingSession
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+def _databases(tmp_path, replica_url=None):
+    primary = create_engine(f"sqlite:///{tmp_path}/primary.db")
+    replica = create_engine(replica_url or f"sqlite:///{tmp_path}/replica.db")
+    Base.metadata.create_all(primary)
+    if not replica_url:
+        Base.metadata.create_all(replica)
+
+    pins = PrimaryPins(seconds=5)
+    factory = sessionmaker(
+        class_=RoutingSession,
+        primary=primary,
+        replicas=ReplicaPool([replica], eject_seconds=30),
+        pins=pins,
+    )
+    return primary, replica, factory
+
+
+def _seed(engine, name):
+    with sessionmaker(bind=engine)() as db:
+        db.add(Item(id=1, name=name))
+        db.commit()
+
+
+def test_reads_go_to_replica(tmp_path):
+    primary, replica, factory = _databases(tmp_path)
+    _seed(primary, "primary")
+    _seed(replica, "replica")
+
+    with factory() as db:
+        assert db.read(lambda: db.get(Item, 1)).name == "replica"
+        # Outside read() everything stays on the primary
+        db.expunge_all()
+        assert db.get(Item, 1).name == "primary"
+
+
+def test_replica_miss_falls_back_to_primary(tmp_path):
+    primary, replica, factory = _databases(tmp_path)
+    _seed(primary, "primary")
+
+    with factory() as db:
+        assert db.read(lambda: db.get(Item, 1)).name == "primary"
+
+
+def test_reads_after_write_stay_on_primary(tmp_path):
+    primary, replica, factory = _databases(tmp_path)
+    _seed(replica, "stale")
+
+    with factory() as db:
+        db.add(Item(id=1, name="fresh"))
+        db.commit()
+        db.expunge_all()
+        assert db.read(lambda: db.get(Item, 1)).name == "fresh"
+
+
+def test_pinned_key_reads_from_primary(tmp_path):
+    primary, replica, factory = _databases(tmp_path)
+    _seed(primary, "primary")
+    _seed(replica, "replica")
+
+    with factory() as db:
+        db.pin("item-1")
+
+    with factory() as db:
+        assert db.read(lambda: db.get(Item, 1), pin_key="item-1").name == "primary"
+
+
+def test_failed_replica_is_ejected(tmp_path):
+    primary, replica, factory = _databases(
+        tmp_path, replica_url=f"sqlite:///{tmp_path}/missing/replica.db"
+    )
+    _seed(primary, "primary")
+
+    with factory() as db:
+        assert db.read(lambda: db.get(Item, 1)).name == "primary"
+
+    assert not factory.kw["replicas"].is_healthy(replica)
@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.jwt import create_access_token
+from app.main import create_app
+from app.services import claims_cache
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    regular = TestClient(create_app())
+    monkeypatch.setattr(settings, "FASTPATH_ENABLED", True)
+    fast = TestClient(create_app())
+    return regular, fast
+
+
+def _token(scope="read", session_id="sid-1"):
+    return create_access_token("user-1", "client-1", scope, session_id=session_id)
+
+
+def _same(regular_response, fast_response):
+    assert fast_response.status_code == regular_response.status_code
+    assert fast_response.content == regular_response.content
+    for header in ("content-type", "content-length", "www-authenticate", "retry-after"):
+        assert fast_response.headers.get(header) == regular_response.headers.get(header)
+
+
+@pytest.mark.parametrize(
+    "request_kwargs",
+    [
+        {"data": {"token": "not-a-token"}},
+        {"data": {"token": "a.b.c"}},
+        {"data": {}},
+        {"data": {"token": ""}},
+        {"json": {"token": "a.b.c"}},
+        {"content": b"token=a&token=b", "headers": {"Content-Type": "application/x-www-form-urlencoded"}},
+    ],
+)
+def test_introspect_matches_regular_route(clients, request_kwargs):
+    regular, fast = clients
+    _same(
+        regular.post("/api/v1/oauth/introspect", **request_kwargs),
+        fast.post("/api/v1/oauth/introspect", **request_kwargs),
+    )
+
+
+def test_introspect_active_token_matches(clients):
+    regular, fast = clients
+    token = _token()
+    _same(
+        regular.post("/api/v1/oauth/introspect", data={"token": token}),
+        fast.post("/api/v1/oauth/introspect", data={"token": token}),
+    )
+
+
+@pytest.mark.parametrize(
+    "authorization",
+    [None, "Basic dXNlcjpwYXNz", "Bearer", "Bearer not-a-token", "Bearer a.b.c", "token"],
+)
+def test_userinfo_errors_match_regular_route(clients, authorization):
+    regular, fast = clients
+    headers = {"Authorization": authorization} if authorization else {}
+    _same(
+        regular.get("/api/v1/userinfo/me", headers=headers),
+        fast.get("/api/v1/userinfo/me", headers=headers),
+    )
+
+
+@pytest.mark.parametrize("scope", ["read", "openid profile email"])
+def test_userinfo_matches_regular_route(clients, monkeypatch, scope):
+    monkeypatch.setattr(
+        claims_cache.claims_cache,
+        "get",
+        lambda user_id: {"sub": user_id, "email": "u@example.com", "email_verified": False, "name": "Ü"},
+    )
+    regular, fast = clients
+
+    for token in (_token(scope), _token(scope, session_id=None)):
+        headers = {"Authorization": f"Bearer {token}"}
+        _same(
+            regular.get("/api/v1/userinfo/me", headers=headers),
+            fast.get("/api/v1/userinfo/me", headers=headers),
+        )
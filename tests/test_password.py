@@ -0,0 +1,39 @@
+from app.utils.password import build_context
+
+
+def test_current_hash_not_rehashed():
+    context = build_context("bcrypt", bcrypt_rounds=5)
+    verified, new_hash = context.verify_and_update("secret", context.hash("secret"))
+
+    assert verified
+    assert new_hash is None
+
+
+def test_weaker_bcrypt_cost_rehashed():
+    old = build_context("bcrypt", bcrypt_rounds=4).hash("secret")
+    context = build_context("bcrypt", bcrypt_rounds=5)
+
+    verified, new_hash = context.verify_and_update("secret", old)
+
+    assert verified
+    assert new_hash.startswith("$2b$05$")
+
+
+def test_wrong_password_never_rehashed():
+    old = build_context("bcrypt", bcrypt_rounds=4).hash("secret")
+    context = build_context("bcrypt", bcrypt_rounds=5)
+
+    assert context.verify_and_update("wrong", old) == (False, None)
+
+
+def test_bcrypt_migrated_to_argon2id():
+    old = build_context("bcrypt", bcrypt_rounds=4).hash("secret")
+    context = build_context(
+        "argon2", argon2_time_cost=1, argon2_memory_cost=1024, argon2_parallelism=1
+    )
+
+    verified, new_hash = context.verify_and_update("secret", old)
+
+    assert verified
+    assert new_hash.startswith("$argon2id$")
+    assert not context.needs_update(new_hash)
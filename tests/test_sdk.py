@@ -0,0 +1,96 @@
+import pytest
+
+from app.core.config import settings
+from app.core.jwt import create_access_token
+from app.core.redis import redis_client
+from app.sdk import HTTPResponse, InvalidToken, TokenValidator, sid_digest
+from app.sdk.revocation import basic_auth
+
+# The revocation feed is a Redis stream
+requires_redis = pytest.mark.skipif(not redis_client, reason="REDIS_URL not configured")
+
+
+def _in_process_get(client):
+    # Route SDK HTTP calls to the in-process app instead of the network
+    def http_get(url, headers):
+        response = client.get(url, headers=headers)
+        return HTTPResponse(
+            response.status_code,
+            {k.lower(): v for k, v in response.headers.items()},
+            response.content,
+        )
+    return http_get
+
+
+def _validator(client):
+    validator = TokenValidator.for_server(
+        "/api/v1",
+        issuer=settings.ISSUER,
+        client_id="example_client",
+        client_secret="secret",
+        http_get=_in_process_get(client),
+    )
+    validator.revocations.poll()
+    return validator
+
+
+def test_sdk_validates_token_offline(client):
+    validator = _validator(client)
+    token = create_access_token("user", "example_client", "read", session_id="sid-1")
+
+    assert validator.validate(token)["sid"] == "sid-1"
+
+    # client_credentials: no session to check
+    token = create_access_token("example_client", "example_client", "read")
+    assert validator.validate(token)["sub"] == "example_client"
+
+
+def test_sdk_jwks_revalidates_with_etag(client):
+    first = client.get("/api/v1/oauth/jwks.json")
+    second = client.get(
+        "/api/v1/oauth/jwks.json",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert second.status_code == 304
+
+
+@requires_redis
+def test_sdk_rejects_revoked_session(client):
+    from app.services.revocation_feed import publish_revocation
+
+    validator = _validator(client)
+    token = create_access_token("user", "example_client", "read", session_id="sid-2")
+
+    publish_revocation("sid-2")
+    validator.revocations.poll()
+
+    with pytest.raises(InvalidToken) as exc:
+        validator.validate(token)
+    assert exc.value.detail == "Session revoked"
+
+
+def test_sdk_rejects_expired_token(client, monkeypatch):
+    validator = _validator(client)
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_EXPIRE_SECONDS", -1)
+    token = create_access_token("user", "example_client", "read", session_id="sid-3")
+
+    with pytest.raises(InvalidToken) as exc:
+        validator.validate(token)
+    assert exc.value.detail == "Token expired"
+
+
+@requires_redis
+def test_revocation_feed_requires_client_and_hides_sids(client):
+    from app.services.revocation_feed import publish_revocation
+
+    publish_revocation("sid-4")
+
+    assert client.get("/api/v1/oauth/revocations").status_code == 401
+    wrong = {"Authorization": basic_auth("example_client", "wrong")}
+    assert client.get("/api/v1/oauth/revocations", headers=wrong).status_code == 401
+
+    right = {"Authorization": basic_auth("example_client", "secret")}
+    response = client.get("/api/v1/oauth/revocations", headers=right)
+    assert response.status_code == 200
+    assert b"sid-4" not in response.content
+    assert sid_digest("sid-4") in [e["sid_sha256"] for e in response.json()["revoked"]]
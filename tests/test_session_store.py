@@ -0,0 +1,85 @@
+import uuid
+
+import pytest
+
+from app.core.redis import redis_binary_client, redis_client
+from app.services.session_store import (
+    ACTIVE,
+    REVOKED,
+    CompactSessionStore,
+    LegacySessionStore,
+)
+
+pytestmark = pytest.mark.skipif(not redis_binary_client, reason="REDIS_URL not configured")
+
+
+def _stores():
+    legacy = LegacySessionStore(redis_client)
+    compact = CompactSessionStore(redis_binary_client, bucket_bits=14, fallback=legacy)
+    return legacy, compact
+
+
+def test_compact_session_lifecycle():
+    _, compact = _stores()
+    sid = uuid.uuid4()
+
+    assert compact.status(sid) is None
+    compact.activate(sid, "user", 60)
+    assert compact.status(str(sid)) == ACTIVE
+    compact.revoke(sid)
+    assert compact.status(sid) == REVOKED
+
+
+def test_compact_reads_fall_back_to_legacy_keys():
+    legacy, compact = _stores()
+    sid = uuid.uuid4()
+
+    legacy.activate(sid, "user", 60)
+    assert compact.status(sid) == ACTIVE
+
+
+def test_migration_does_not_overwrite_new_state():
+    legacy, compact = _stores()
+    sid = uuid.uuid4()
+
+    compact.revoke(sid)
+    pipe = redis_binary_client.pipeline(transaction=False)
+    compact.import_entry(pipe, sid, ACTIVE, 60)
+    pipe.execute()
+
+    assert compact.status(sid) == REVOKED
+
+
+def test_revoked_session_not_revived_by_legacy_key():
+    legacy, compact = _stores()
+    sid = uuid.uuid4()
+
+    legacy.activate(sid, "user", 3600)
+    compact.revoke(sid)
+    assert compact.status(sid) == REVOKED
+
+    # The revoked field expires (sweep() or HEXPIRE) long before the session would
+    key, field = compact._location(sid)
+    redis_binary_client.hdel(key, field)
+
+    assert compact.status(sid) is None
+    assert legacy.status(sid) is None
+
+
+def test_deleting_legacy_keys_never_revives_a_session():
+    from scripts import migrate_sessions
+
+    legacy = LegacySessionStore(redis_client)
+    # Step 3 done: the fallback is off, so revoking leaves the legacy key
+    compact = CompactSessionStore(redis_binary_client, bucket_bits=14)
+    sid = uuid.uuid4()
+
+    legacy.activate(sid, "user", 3600)
+    compact.revoke(sid)
+    key, field = compact._location(sid)
+    redis_binary_client.hdel(key, field)
+
+    migrate_sessions.main(["delete-legacy"])
+
+    assert compact.status(sid) is None
+    assert legacy.status(sid) is None
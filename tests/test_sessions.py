@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.routing import PrimaryPins, ReplicaPool, RoutingSession
+from app.models.session import UserSession
+from app.models.token import RefreshToken
+from app.models.user import User
+from app.services.session_service import SessionService
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/sessions.db")
+    Base.metadata.create_all(
+        engine,
+        tables=[User.__table__, UserSession.__table__, RefreshToken.__table__],
+    )
+    factory = sessionmaker(
+        class_=RoutingSession,
+        primary=engine,
+        replicas=ReplicaPool([], eject_seconds=30),
+        pins=PrimaryPins(seconds=5),
+    )
+    with factory() as session:
+        yield session
+
+
+def _seed(db, user_id, count, active=True):
+    now = datetime.utcnow()
+    sessions = [
+        UserSession(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            is_active=active,
+            # Pairs share a timestamp so the id tie-breaker is exercised
+            created_at=now - timedelta(minutes=i // 2),
+            expires_at=now + timedelta(days=1),
+        )
+        for i in range(count)
+    ]
+    db.add_all(sessions)
+    db.commit()
+    return sessions
+
+
+def test_list_sessions_keyset_pages(db):
+    user_id = uuid.uuid4()
+    _seed(db, user_id, 7)
+    _seed(db, user_id, 2, active=False)
+    _seed(db, uuid.uuid4(), 3)
+
+    service = SessionService(db)
+    seen, cursor = [], None
+    while True:
+        page = service.list_sessions(user_id, limit=3, cursor=cursor)
+        seen += page["sessions"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    keys = [(s["created_at"], s["id"]) for s in seen]
+    assert len(seen) == 7
+    assert len(set(keys)) == 7
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_invalid_cursor(db):
+    with pytest.raises(HTTPException) as exc:
+        SessionService(db).list_sessions(uuid.uuid4(), limit=10, cursor="not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_revoke_single_session(db):
+    user_id = uuid.uuid4()
+    target, other = _seed(db, user_id, 2)
+    db.add(RefreshToken(token="rt-1", user_id=user_id, session_id=target.id))
+    db.commit()
+
+    SessionService(db).revoke_session(user_id, target.id)
+
+    listed = SessionService(db).list_sessions(user_id, limit=10)["sessions"]
+    assert [s["id"] for s in listed] == [str(other.id)]
+    assert db.get(RefreshToken, "rt-1").is_revoked
+
+
+def test_revoke_foreign_session_not_found(db):
+    (session,) = _seed(db, uuid.uuid4(), 1)
+
+    with pytest.raises(HTTPException) as exc:
+        SessionService(db).revoke_session(uuid.uuid4(), session.id)
+    assert exc.value.status_code == 404
+
+
+def test_oauth_revocation_deactivates_session(db):
+    from app.core.jwt import create_access_token
+    from app.services.token_service import TokenService
+
+    user_id = uuid.uuid4()
+    (session,) = _seed(db, user_id, 1)
+    token = create_access_token(user_id, "example_client", "read", session_id=session.id)
+
+    TokenService(db).revoke_token(token)
+
+    db.expire_all()
+    assert db.get(UserSession, session.id).is_active is False
+
+
+def test_revoke_in_store_pipelines_each_chunk(db, monkeypatch):
+    from app.db.routing import PrimaryPins
+    from app.services import revocation_feed, session_service
+
+    class RecordingRedis:
+        def __init__(self):
+            self.round_trips = 0
+            self.commands = 0
+
+        def pipeline(self, transaction=True):
+            return self
+
+        def setex(self, *args):
+            self.commands += 1
+
+        def xadd(self, *args, **kwargs):
+            self.commands += 1
+
+        def execute(self):
+            self.round_trips += 1
+
+    class RecordingStore:
+        def revoke_many(self, session_ids):
+            pass
+
+    redis = RecordingRedis()
+    monkeypatch.setattr(session_service, "session_store", RecordingStore())
+    monkeypatch.setattr(revocation_feed, "redis_client", redis)
+    monkeypatch.setattr(db, "pins", PrimaryPins(seconds=5, redis_client=redis))
+
+    session_ids = [uuid.uuid4() for _ in range(1000)]
+    session_service.revoke_in_store(db, session_ids)
+
+    # One pipeline for the feed entries, one for the primary pins
+    assert redis.commands == 2000
+    assert redis.round_trips == 2
+    assert db.pins.is_pinned(session_ids[-1])
@@ -0,0 +1,321 @@
+"""
+Soak test: mixed OAuth flows against the app for SOAK_SECONDS, failing if
+the Python heap, RSS, checked-out database connections, Redis connections
+in use or open file descriptors grow past a threshold.
+
+Skipped unless SOAK_SECONDS is set. Needs the same database and Redis as
+the rest of the suite; it seeds its own users and client.
+
+    SOAK_SECONDS=1800 SOAK_USERS=8 python -m pytest -q -s tests/test_soak.py
+
+The app runs in-process on one event loop, like a single worker. Growth is
+measured between two quiescent points (no request in flight, after
+gc.collect()): one after a warm-up, one at the end. Samples taken in
+between are printed to show the trend.
+"""
+
+import asyncio
+import gc
+import os
+import resource
+import time
+import tracemalloc
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+SOAK_SECONDS = float(os.getenv("SOAK_SECONDS", "0"))
+WARMUP_SECONDS = float(os.getenv("SOAK_WARMUP_SECONDS", str(min(60.0, SOAK_SECONDS / 10))))
+SAMPLE_SECONDS = float(os.getenv("SOAK_SAMPLE_SECONDS", "10"))
+USERS = int(os.getenv("SOAK_USERS", "8"))
+
+MAX_HEAP_GROWTH_KB = int(os.getenv("SOAK_MAX_HEAP_GROWTH_KB", "4096"))
+MAX_RSS_GROWTH_KB = int(os.getenv("SOAK_MAX_RSS_GROWTH_KB", "32768"))
+MAX_FD_GROWTH = int(os.getenv("SOAK_MAX_FD_GROWTH", "4"))
+MAX_DB_CHECKED_OUT_GROWTH = int(os.getenv("SOAK_MAX_DB_CHECKED_OUT_GROWTH", "0"))
+MAX_REDIS_IN_USE_GROWTH = int(os.getenv("SOAK_MAX_REDIS_IN_USE_GROWTH", "0"))
+
+pytestmark = pytest.mark.skipif(not SOAK_SECONDS, reason="set SOAK_SECONDS to run the soak test")
+
+API = "/api/v1"
+BASE_URL = "https://soak.test"
+SOAK_CLIENT_ID = "soak-client"
+SOAK_CLIENT_SECRET = "soak-client-secret"
+SOAK_REDIRECT_URI = "https://soak.test/callback"
+SOAK_EMAIL = "soak-{n}@example.com"
+SOAK_PASSWORD = "soak-password"
+SOAK_SCOPE = "openid profile email read"
+
+# Calls of the cheap, high-QPS endpoints per login
+READS_PER_LOGIN = 10
+
+
+# ------------------------
+# Seed
+# ------------------------
+
+def _seed():
+    from app.db.session import SessionLocal
+    from app.models.client import OAuthClient
+    from app.models.user import User
+    from app.utils.password import hash_password
+
+    db = SessionLocal()
+    try:
+        password_hash = hash_password(SOAK_PASSWORD)
+        emails = [SOAK_EMAIL.format(n=n) for n in range(USERS)]
+        existing = {e for (e,) in db.query(User.email).filter(User.email.in_(emails))}
+        db.add_all(User(email=e, password_hash=password_hash) for e in emails if e not in existing)
+
+        client = db.query(OAuthClient).filter_by(client_id=SOAK_CLIENT_ID).first()
+        if not client:
+            client = OAuthClient(client_id=SOAK_CLIENT_ID)
+            db.add(client)
+        client.client_secret_hash = hash_password(SOAK_CLIENT_SECRET)
+        client.redirect_uris = [SOAK_REDIRECT_URI]
+        client.allowed_grant_types = ["authorization_code", "refresh_token", "client_credentials"]
+        client.allowed_scopes = SOAK_SCOPE.split()
+        db.commit()
+    finally:
+        db.close()
+
+
+# ------------------------
+# Flows
+# ------------------------
+
+def _expect(response, status):
+    assert response.status_code == status, (
+        f"{response.request.method} {response.request.url.path}: "
+        f"{response.status_code} {response.text[:200]}"
+    )
+    return response
+
+
+async def _journey(http, email, n):
+    """One device: log in, get tokens, use them, then log out."""
+    _expect(
+        await http.post(f"{API}/sso/login", data={"email": email, "password": SOAK_PASSWORD}),
+        307,
+    )
+
+    location = _expect(
+        await http.get(
+            f"{API}/oauth/authorize",
+            params={
+                "response_type": "code",
+                "client_id": SOAK_CLIENT_ID,
+                "redirect_uri": SOAK_REDIRECT_URI,
+                "scope": SOAK_SCOPE,
+                "nonce": f"n-{n}",
+            },
+        ),
+        307,
+    ).headers["location"]
+    code = parse_qs(urlsplit(location).query)["code"][0]
+
+    tokens = _expect(
+        await http.post(
+            f"{API}/oauth/token",
+            data={
+                "grant_type": "authorization_code",
+                "client_id": SOAK_CLIENT_ID,
+                "client_secret": SOAK_CLIENT_SECRET,
+                "code": code,
+                "redirect_uri": SOAK_REDIRECT_URI,
+            },
+        ),
+        200,
+    ).json()
+    bearer = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    for _ in range(READS_PER_LOGIN):
+        introspected = _expect(
+            await http.post(f"{API}/oauth/introspect", data={"token": tokens["access_token"]}),
+            200,
+        ).json()
+        assert introspected["active"]
+        _expect(await http.get(f"{API}/userinfo/me", headers=bearer), 200)
+
+    _expect(
+        await http.post(
+            f"{API}/oauth/token",
+            data={
+                "grant_type": "refresh_token",
+                "client_id": SOAK_CLIENT_ID,
+                "refresh_token": tokens["refresh_token"],
+            },
+        ),
+        200,
+    )
+    _expect(
+        await http.post(
+            f"{API}/oauth/token",
+            data={
+                "grant_type": "client_credentials",
+                "client_id": SOAK_CLIENT_ID,
+                "client_secret": SOAK_CLIENT_SECRET,
+                "scope": "read",
+            },
+        ),
+        200,
+    )
+
+    sessions = _expect(await http.get(f"{API}/sso/sessions", params={"limit": 10}), 200).json()
+    current = next(s["id"] for s in sessions["sessions"] if s["current"])
+
+    # Alternate between the two ways out
+    if n % 2:
+        _expect(await http.delete(f"{API}/sso/sessions/{current}"), 200)
+    else:
+        _expect(await http.post(f"{API}/sso/logout"), 200)
+    http.cookies.clear()
+
+
+async def _user(app, n, running, counts):
+    import httpx
+
+    email = SOAK_EMAIL.format(n=n)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as http:
+        while running.is_set():
+            await _journey(http, email, counts["journeys"])
+            counts["journeys"] += 1
+
+
+# ------------------------
+# Samples
+# ------------------------
+
+def _rss_kb() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        # Peak rather than current, but still catches steady growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _open_fds() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return 0
+
+
+def _db_checked_out() -> int:
+    from app.db.session import engine, replica_engines, shard_engines
+
+    engines = [engine, *replica_engines, *shard_engines]
+    return sum(getattr(e.pool, "checkedout", lambda: 0)() for e in engines)
+
+
+def _redis_in_use() -> int:
+    from app.core import redis as redis_module
+
+    return sum(
+        len(getattr(client.connection_pool, "_in_use_connections", ()))
+        for client in (redis_module.redis_client, redis_module.redis_binary_client)
+        if client is not None
+    )
+
+
+def _sample(elapsed: float, journeys: int) -> dict:
+    return {
+        "t": elapsed,
+        "journeys": journeys,
+        "heap_kb": tracemalloc.get_traced_memory()[0] // 1024,
+        "rss_kb": _rss_kb(),
+        "fds": _open_fds(),
+        "db": _db_checked_out(),
+        "redis": _redis_in_use(),
+    }
+
+
+def _print_sample(sample):
+    print(
+        "{t:8.0f}s {journeys:9d} {heap_kb:10d} {rss_kb:10d} {fds:5d} {db:4d} {redis:6d}".format(**sample)
+    )
+
+
+# ------------------------
+# Test
+# ------------------------
+
+async def _run(seconds, counts, on_sample=None):
+    """Run all users for `seconds`; returns once every request has finished."""
+    from app.main import app
+
+    running = asyncio.Event()
+    running.set()
+    users = [asyncio.create_task(_user(app, n, running, counts)) for n in range(USERS)]
+
+    started = time.monotonic()
+    try:
+        while time.monotonic() - started < seconds:
+            await asyncio.sleep(min(SAMPLE_SECONDS, seconds))
+            for task in users:
+                if task.done():
+                    task.result()   # raises the failed flow's assertion
+            if on_sample:
+                on_sample(time.monotonic() - started)
+    finally:
+        running.clear()
+        await asyncio.gather(*users)
+
+
+def test_soak_no_growth():
+    from app.main import app
+
+    _seed()
+    counts = {"journeys": 0}
+    samples = []
+
+    async def soak():
+        async with app.router.lifespan_context(app):
+            await _run(WARMUP_SECONDS, counts)
+
+            gc.collect()
+            tracemalloc.start(25)
+            baseline_snapshot = tracemalloc.take_snapshot()
+            baseline = _sample(0.0, counts["journeys"])
+
+            print(f"\n{'elapsed':>9} {'journeys':>9} {'heap KiB':>10} {'RSS KiB':>10} {'fds':>5} {'db':>4} {'redis':>6}")
+            _print_sample(baseline)
+
+            def on_sample(elapsed):
+                samples.append(_sample(elapsed, counts["journeys"]))
+                _print_sample(samples[-1])
+
+            await _run(SOAK_SECONDS, counts, on_sample)
+
+            gc.collect()
+            final = _sample(SOAK_SECONDS, counts["journeys"])
+            final_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            _print_sample(final)
+            return baseline, final, baseline_snapshot, final_snapshot
+
+    baseline, final, baseline_snapshot, final_snapshot = asyncio.run(soak())
+
+    limits = {
+        "heap_kb": MAX_HEAP_GROWTH_KB,
+        "rss_kb": MAX_RSS_GROWTH_KB,
+        "fds": MAX_FD_GROWTH,
+        "db": MAX_DB_CHECKED_OUT_GROWTH,
+        "redis": MAX_REDIS_IN_USE_GROWTH,
+    }
+    exceeded = [
+        f"{name} grew by {final[name] - baseline[name]} (limit {limit})"
+        for name, limit in limits.items()
+        if final[name] - baseline[name] > limit
+    ]
+
+    top = final_snapshot.filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    ).compare_to(baseline_snapshot, "lineno")[:15]
+    report = "\n".join(str(stat) for stat in top)
+    print(f"\n{final['journeys'] - baseline['journeys']} journeys; top allocation growth:\n{report}")
+
+    assert final["journeys"] > baseline["journeys"], "no flow completed during the soak"
+    assert not exceeded, "; ".join(exceeded) + "\n\nTop allocation growth:\n" + report